@@ -0,0 +1,123 @@
+"""Ad-hoc performance measurements for the forward lists, e.g.
+
+    python -m forward_list.benchmarks access -n 1000000
+"""
+import argparse
+import random
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List
+
+from forward_list.forward_doubly_linked_list import (
+    ArrayForwardList,
+    ForwardList,
+    Node,
+    add_double_references,
+    build_forward_list,
+    forward_list_len,
+    iterate_nodes,
+)
+
+
+# add_double_references before the queue became a deque, kept as the baseline
+def _add_double_references_pop_front(head: Node) -> Node:
+    if not head.next:
+        return head
+
+    reference_limit = forward_list_len(head) / 2
+    queue = []
+
+    for i, node in enumerate(iterate_nodes(head.next), start=1):
+        if i < reference_limit:
+            queue.append(node)
+
+        if i % 2 == 0:
+            queue.pop(0).double = node
+
+    return head
+
+
+def _time(function: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def benchmark_forward_lists(n: int, lookups: int = 100_000) -> Dict[str, dict]:
+    rng = random.Random(0)
+    indexes = [rng.randrange(n) for _ in range(lookups)]
+    results = {}
+
+    # both including the build of the linked list
+    results["add_double_references"] = {
+        "pop_front_s": _time(lambda: _add_double_references_pop_front(build_forward_list(range(n)))),
+        "deque_s": _time(lambda: add_double_references(build_forward_list(range(n)))),
+    }
+
+    for forward_list_class in (ForwardList, ArrayForwardList):
+        start = time.perf_counter()
+        fl = forward_list_class(range(n))
+        build_time = time.perf_counter() - start
+
+        results[forward_list_class.__name__] = {
+            "n": n,
+            "build_s": build_time,
+            "len_s": _time(lambda: len(fl)),
+            "iterate_s": _time(lambda: sum(fl)),
+            "index_us": 1e6 * _time(lambda: [fl[i] for i in indexes]) / lookups,
+        }
+
+    return results
+
+
+def benchmark_updates(n: int, operations: int = 10_000, rebuilds: int = 3) -> Dict[str, dict]:
+    """Seconds per operation on a list of n values"""
+    rng = random.Random(0)
+    # in the first half, so the positions stay valid while deletes shrink the list
+    positions = [rng.randrange(n // 2) for _ in range(operations)]
+
+    def run(make: Callable[[List[int]], Any], update: Callable[[Any, int], None], count: int) -> float:
+        container = make(list(range(n)))
+        return _time(lambda: [update(container, position) for position in positions[:count]]) / count
+
+    updates = {
+        "append": lambda container, position: container.append(position),
+        "pop": lambda container, position: container.pop(),
+        "insert": lambda container, position: container.insert(position, position),
+        "delete": lambda container, position: container.__delitem__(position),
+    }
+    containers = {"ArrayForwardList": ArrayForwardList, "list": list, "deque": deque}
+
+    results = {}
+    for name, update in updates.items():
+        results[name] = {
+            f"{container_name}_us": 1e6 * run(make, update, operations) for container_name, make in containers.items()
+        }
+        # without incremental updates every change is followed by a rebuild of the whole forward list
+        for forward_list_class in (ArrayForwardList, ForwardList):
+            results[name][f"{forward_list_class.__name__}_rebuild_us"] = 1e6 * run(
+                list, lambda values, position: (update(values, position), forward_list_class(values)), rebuilds
+            )
+
+    return results
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("benchmark", choices=["access", "updates"])
+    parser.add_argument("-n", "--size", type=int, default=1_000_000, help="Number of list elements")
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    if args.benchmark == "access":
+        for name, result in benchmark_forward_lists(args.size).items():
+            print(name, result)
+    elif args.benchmark == "updates":
+        for name, result in benchmark_updates(args.size).items():
+            print(name, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-from typing import Iterable, Any
+from array import array as link_array
+from collections import deque
+from typing import Iterable, Any, Optional, Union
 from dataclasses import dataclass
 
+# link of the last node, and double link of the nodes without a node at twice their index
+NO_NODE = -1
+
 
 @dataclass
 class Node:
@@ -38,15 +43,15 @@ def add_double_references(head: Node) -> Node:
     if not head.next:
         return head
 
-    reference_limit = forward_list_len(head) / 2
-    queue = []
+    # node i gets its double when node 2 * i comes by, the queue holds the nodes waiting for it.
+    # nodes past the middle are queued as well, it saves counting the nodes in a separate pass
+    queue = deque()
 
     for i, node in enumerate(iterate_nodes(head.next), start=1):
-        if i < reference_limit:
-            queue.append(node)
+        queue.append(node)
 
         if i % 2 == 0:
-            queue.pop(0).double = node
+            queue.popleft().double = node
 
     return head
 
@@ -76,3 +81,152 @@ class ForwardList:
 
     def __getitem__(self, index: int) -> Any:
         return get_node_at_index(self.root, index).value
+
+
+class ArrayForwardList:
+    """ForwardList that keeps the values and the next/double links of its nodes in parallel arrays.
+
+    Node i is stored at position i, so the length is known and indexing is a single array lookup,
+    while the links are still there to be followed from the root node.
+
+    The list can be changed in place, with the costs of the matching list methods. Node views are
+    positions, after an insert or a delete a view refers to whatever node is at its position then.
+    """
+
+    class Node:
+        """Lightweight view of a node position"""
+
+        __slots__ = ("_forward_list", "index")
+
+        def __init__(self, forward_list: ArrayForwardList, index: int):
+            self._forward_list = forward_list
+            self.index = index
+
+        @property
+        def value(self) -> Any:
+            return self._forward_list._values[self.index]
+
+        @property
+        def next(self) -> Optional[ArrayForwardList.Node]:
+            return self._forward_list._get_node(self._forward_list._next[self.index])
+
+        @property
+        def double(self) -> Optional[ArrayForwardList.Node]:
+            return self._forward_list._get_node(self._forward_list._double[self.index])
+
+        def __eq__(self, other: object) -> bool:
+            return (
+                isinstance(other, ArrayForwardList.Node)
+                and self._forward_list is other._forward_list
+                and self.index == other.index
+            )
+
+    def __init__(self, array: Iterable[Any]):
+        self._values = []
+        self._next = link_array("l")
+        self._double = link_array("l")
+        self.extend(array)
+
+    def append(self, value: Any) -> None:
+        """Amortized O(1)"""
+        self._values.append(value)
+        self._grow_links(len(self._values) - 1)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        """Amortized O(k) for k values"""
+        # materialized first, so extending by the list itself ends,
+        # and an iterable that raises leaves the values and the links unchanged
+        values = list(values)
+        n = len(self._values)
+        self._values.extend(values)
+        self._grow_links(n)
+
+    def insert(self, index: int, value: Any) -> None:
+        """O(n - index), the values after the index move by one, the links are repaired in O(1)"""
+        self._values.insert(index, value)
+        self._grow_links(len(self._values) - 1)
+
+    def pop(self, index: int = -1) -> Any:
+        """O(1) from the end, O(n - index) elsewhere, like list.pop"""
+        value = self._values.pop(index)
+        self._shrink_links(len(self._values) + 1)
+        return value
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        """O(n - index), the links are repaired in O(1) per removed node"""
+        n = len(self._values)
+        del self._values[index]
+        self._shrink_links(n)
+
+    # the links of a node only depend on its position and the length of the list, node i links to
+    # i + 1 and 2 * i. a change in the middle moves the values, but the links stay in place,
+    # only the nodes around the old and the new end gain or lose their links
+    def _grow_links(self, n: int) -> None:
+        """Links the nodes n.. after the list grew from n nodes"""
+        m = len(self._values)
+        if m == n + 1:
+            # a single node, the common case of append and insert, without building temporary arrays
+            self._next.append(NO_NODE)
+            self._double.append(NO_NODE)
+            if n:
+                self._next[n - 1] = n
+            if n and not n % 2:
+                self._double[n // 2] = n
+            return
+        if m == n:
+            return
+
+        # the old last node is followed by the new nodes now
+        self._next[max(n - 1, 0):] = link_array("l", range(max(n, 1), m + 1))
+        self._next[m - 1] = NO_NODE
+
+        self._double.extend(link_array("l", [NO_NODE]) * (m - n))
+        # nodes up to the middle, but not the root, gain the nodes at twice their index
+        start, stop = max(1, (n + 1) // 2), (m + 1) // 2
+        self._double[start:stop] = link_array("l", range(2 * start, 2 * stop, 2))
+
+    def _shrink_links(self, n: int) -> None:
+        """Unlinks the removed nodes after the list shrunk from n nodes"""
+        m = len(self._values)
+        if m == n - 1:
+            self._next.pop()
+            self._double.pop()
+            if m:
+                self._next[m - 1] = NO_NODE
+            if m and not m % 2:
+                self._double[m // 2] = NO_NODE
+            return
+        if m == n:
+            return
+
+        del self._next[m:]
+        if m:
+            self._next[m - 1] = NO_NODE
+
+        del self._double[m:]
+        # nodes past the new middle lose their doubles
+        start, stop = max(1, (m + 1) // 2), min(m, (n + 1) // 2)
+        if start < stop:
+            self._double[start:stop] = link_array("l", [NO_NODE]) * (stop - start)
+
+    @property
+    def root(self) -> Optional[ArrayForwardList.Node]:
+        return self._get_node(0 if self._values else NO_NODE)
+
+    def _get_node(self, index: int) -> Optional[ArrayForwardList.Node]:
+        return None if index == NO_NODE else self.Node(self, index)
+
+    def __iter__(self) -> Iterable[Any]:
+        # next links point to the following position, so the values are already in list order
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return ArrayForwardList(self._values[index])
+
+        if not -len(self._values) <= index < len(self._values):
+            raise IndexError("forward list index out of range")
+        return self._values[index]
@@ -5,8 +5,14 @@ from ..forward_doubly_linked_list import (
     add_double_references,
     get_node_at_index,
     ForwardList,
+    ArrayForwardList,
+    NO_NODE,
 )
 
+import random
+
+import pytest
+
 
 def test_build_forward_list():
     fl = build_forward_list(range(10))
@@ -48,3 +54,133 @@ def test_forward_list():
     assert list(fl) == list(range(10))
     for i in range(10):
         assert fl[i] == i
+
+
+def test_add_double_references_matches_indexes():
+    for n in range(1, 20):
+        fl = add_double_references(build_forward_list(range(n)))
+
+        for node in iterate_nodes(fl):
+            expected = 2 * node.value if 0 < node.value and 2 * node.value < n else None
+            assert (node.double and node.double.value) == expected
+
+
+def test_array_forward_list():
+    fl = ArrayForwardList(range(10))
+
+    assert len(fl) == 10
+    assert list(fl) == list(range(10))
+    for i in range(10):
+        assert fl[i] == i
+        assert fl[i - 10] == i
+    with pytest.raises(IndexError):
+        fl[10]
+    with pytest.raises(IndexError):
+        fl[-11]
+
+
+def test_array_forward_list_slices():
+    fl = ArrayForwardList(range(10))
+
+    assert list(fl[2:5]) == [2, 3, 4]
+    assert list(fl[::-3]) == [9, 6, 3, 0]
+    assert fl[2:5][1] == 3
+    assert len(fl[20:]) == 0
+
+
+def test_array_forward_list_links():
+    for n in range(1, 20):
+        fl, linked = ArrayForwardList(range(n)), ForwardList(range(n))
+
+        assert [node.value for node in iterate_nodes(fl.root)] == list(range(n))
+        for i in range(n):
+            node, linked_node = get_node_at_index(fl.root, i), get_node_at_index(linked.root, i)
+            assert node.value == i
+            assert (node.double and node.double.value) == (linked_node.double and linked_node.double.value)
+
+    fl = ArrayForwardList(range(10))
+    assert fl.root.next.double == fl.root.next.next
+    assert ArrayForwardList([]).root is None
+
+
+def test_array_forward_list_updates():
+    fl = ArrayForwardList([])
+    fl.append(0)
+    fl.extend(range(1, 6))
+    fl.insert(3, "x")
+    assert list(fl) == [0, 1, 2, "x", 3, 4, 5]
+    assert fl.root.next.next.next.value == "x"
+    assert fl.root.next.next.next.double.value == 5
+
+    assert fl.pop() == 5
+    assert fl.pop(3) == "x"
+    del fl[0]
+    assert list(fl) == [1, 2, 3, 4]
+    assert fl.root.next.double.value == 3
+    assert fl.root.next.next.double is None
+
+    with pytest.raises(IndexError):
+        fl.pop(4)
+    with pytest.raises(IndexError):
+        del fl[-5]
+
+    del fl[1::2]
+    assert list(fl) == [1, 3]
+    assert fl.root.next.next is None
+
+
+def test_array_forward_list_extend_by_itself():
+    fl = ArrayForwardList(range(3))
+    fl.extend(fl)
+
+    assert list(fl) == [0, 1, 2, 0, 1, 2]
+    assert fl.root.next.double.value == 2
+
+
+def test_array_forward_list_extend_keeps_list_on_error():
+    def values():
+        yield 3
+        raise ValueError("broken iterable")
+
+    fl = ArrayForwardList(range(3))
+    with pytest.raises(ValueError):
+        fl.extend(values())
+
+    assert list(fl) == [0, 1, 2]
+    fl.append(3)
+    assert list(fl) == [0, 1, 2, 3]
+    assert fl.root.next.double.value == 2
+
+
+def test_array_forward_list_updates_keep_links():
+    rng = random.Random(42)
+    fl, values = ArrayForwardList([]), []
+    for _ in range(500):
+        operation = rng.choice(["append", "extend", "insert", "pop", "del", "del slice"])
+        if operation == "append":
+            fl.append(len(values))
+            values.append(len(values))
+        elif operation == "extend":
+            new_values = list(range(rng.randrange(5)))
+            fl.extend(new_values)
+            values.extend(new_values)
+        elif operation == "insert":
+            index = rng.randrange(-len(values) - 1, len(values) + 2)
+            fl.insert(index, "x")
+            values.insert(index, "x")
+        elif operation == "del slice":
+            index = slice(rng.randrange(len(values) + 1), rng.randrange(len(values) + 1), rng.choice([1, 2, -1]))
+            del fl[index]
+            del values[index]
+        elif values:
+            index = rng.randrange(-len(values), len(values))
+            if operation == "pop":
+                assert fl.pop(index) == values.pop(index)
+            else:
+                del fl[index]
+                del values[index]
+
+        n = len(values)
+        assert list(fl) == values
+        assert list(fl._next) == [i + 1 if i + 1 < n else NO_NODE for i in range(n)]
+        assert list(fl._double) == [2 * i if 0 < i and 2 * i < n else NO_NODE for i in range(n)]
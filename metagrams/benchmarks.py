@@ -0,0 +1,422 @@
+"""Ad-hoc performance measurements for metagrams, e.g.
+
+    python -m metagrams.benchmarks cache-load -l 5 -f /usr/share/dict/words
+"""
+import argparse
+import contextlib
+import functools
+import json
+import os
+import pathlib
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+import typing as t
+from collections import deque
+
+from word_squeezer.word_list import read_words
+
+from metagrams import distances
+from metagrams.compact_graph import build_compact_neighborhood_graph, collect_words
+from metagrams.edit_graph import build_edit_neighborhood_graph, collect_all_words, find_shortest_edit_chain
+from metagrams.mutable_graph import MutableNeighborhoodGraph
+from metagrams.orthographic_neighborhood import (
+    VOCAB,
+    ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH,
+    WORD_PATH,
+    a_star_search,
+    bidirectional_bfs,
+    build_dijkstra_graph,
+    build_orthographic_neighborhood_graph,
+    check_edit_neighbor,
+    find_shortest_word_chain,
+    find_word_chain,
+    hamming_distance,
+    read_system_vocab,
+)
+from metagrams.orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
+
+# runs in a fresh interpreter, so the peak RSS is not skewed by the parent's heap
+_CACHE_LOAD_SCRIPT = """
+import json, resource, sys, time
+from metagrams.orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
+
+cache_format, word_length, probe = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+start = time.perf_counter()
+graph = OrthographicNeighborhoodGraphBuilder([], cache_format=cache_format)._load_cached_graph(word_length)
+load_time = time.perf_counter() - start
+
+start = time.perf_counter()
+graph.get(probe)
+query_time = time.perf_counter() - start
+
+rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"load_s": load_time, "first_query_s": query_time, "rss_kb": rss_after - rss_before}))
+"""
+
+
+def benchmark_cache_load(vocab: VOCAB, word_length: int) -> t.Dict[str, dict]:
+    probe = next(w for w in vocab if len(w) == word_length)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as cache_root:
+        for cache_format in ("json", "binary"):
+            builder = OrthographicNeighborhoodGraphBuilder(vocab, cache_format=cache_format)
+            with _working_directory(cache_root):
+                builder.build_graph(word_length)
+                cache_file_size = builder._get_cache_file(word_length).stat().st_size
+
+            output = subprocess.run(
+                [sys.executable, "-c", _CACHE_LOAD_SCRIPT, cache_format, str(word_length), probe],
+                cwd=cache_root,
+                env={**os.environ, "PYTHONPATH": str(pathlib.Path(__file__).parent.parent)},
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+            results[cache_format] = {**json.loads(output), "file_bytes": cache_file_size}
+
+    return results
+
+
+def benchmark_graph_representation(vocab: VOCAB, word_length: int) -> t.Dict[str, dict]:
+    def measure(build: t.Callable[[], ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH]) -> t.Tuple[ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, int]:
+        tracemalloc.start()
+        graph = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return graph, size
+
+    dict_graph, dict_bytes = measure(lambda: build_orthographic_neighborhood_graph(vocab, word_length))
+    compact_graph, compact_bytes = measure(lambda: build_compact_neighborhood_graph(vocab, word_length))
+
+    # full sweep over every component, which is the worst case of a traversal
+    def sweep_words() -> None:
+        seen = set()
+        for source in dict_graph:
+            if source in seen:
+                continue
+            seen.add(source)
+            queue = deque([source])
+            while queue:
+                for neighbor in dict_graph[queue.popleft()]:
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+
+    def sweep_ids() -> None:
+        seen = bytearray(len(compact_graph))
+        for source in range(len(compact_graph)):
+            if seen[source]:
+                continue
+            seen[source] = 1
+            queue = deque([source])
+            while queue:
+                for neighbor in compact_graph.neighbor_ids(queue.popleft()):
+                    if not seen[neighbor]:
+                        seen[neighbor] = 1
+                        queue.append(neighbor)
+
+    return {
+        "dict": {"bytes": dict_bytes, "sweep_s": timeit.timeit(sweep_words, number=1)},
+        "compact": {"bytes": compact_bytes, "sweep_s": timeit.timeit(sweep_ids, number=1)},
+    }
+
+
+def benchmark_word_chain(vocab: VOCAB, word_length: int, pairs: int = 200, seed: int = 0) -> t.Dict[str, dict]:
+    graph = build_orthographic_neighborhood_graph(vocab, word_length)
+    rng = random.Random(seed)
+    words = list(graph)
+    word_pairs = [(rng.choice(words), rng.choice(words)) for _ in range(pairs)]
+
+    engines = {
+        "recursive": _find_word_chain_recursive,
+        "iterative": find_word_chain,
+        "iterative-deepening": functools.partial(find_word_chain, iterative_deepening=True),
+    }
+
+    results = {}
+    for name, engine in engines.items():
+        recursion_errors = 0
+        path_lengths = []
+        start = time.perf_counter()
+        for word1, word2 in word_pairs:
+            try:
+                path = engine(word1, word2, graph)
+            except RecursionError:
+                recursion_errors += 1
+                continue
+            if path:
+                path_lengths.append(len(path))
+
+        results[name] = {
+            "total_s": time.perf_counter() - start,
+            "recursion_errors": recursion_errors,
+            "chains": len(path_lengths),
+            "mean_chain_length": sum(path_lengths) / len(path_lengths) if path_lengths else 0,
+        }
+
+    return results
+
+
+def benchmark_shortest_path(vocab: VOCAB, word_length: int, pairs: int = 200, seed: int = 0) -> t.Dict[str, dict]:
+    """Node expansions of the shortest path searches, between words of the largest component"""
+    graph = build_compact_neighborhood_graph(vocab, word_length)
+    sizes = graph.components.component_sizes()
+    largest_component = max(sizes, key=sizes.__getitem__)
+    words = [w for w in graph if graph.components.component_of(w) == largest_component]
+    rng = random.Random(seed)
+    word_pairs = [(rng.choice(words), rng.choice(words)) for _ in range(pairs)]
+
+    def zero(_) -> int:
+        return 0
+
+    searches = {
+        # uniform-cost search, i.e. Dijkstra on unit weights
+        "dijkstra": lambda source, target, get_neighbors: a_star_search(source, target, get_neighbors, zero),
+        "bidirectional-bfs": bidirectional_bfs,
+        "a-star": lambda source, target, get_neighbors: a_star_search(
+            source, target, get_neighbors, lambda i: hamming_distance(graph.words[i], graph.words[target])
+        ),
+    }
+
+    results = {}
+    path_lengths_by_search = {}
+    for name, search in searches.items():
+        expansions = 0
+
+        def get_neighbors(word_id: int) -> t.Sequence[int]:
+            nonlocal expansions
+            expansions += 1
+            return graph.neighbor_ids(word_id)
+
+        start = time.perf_counter()
+        path_lengths_by_search[name] = [
+            len(search(graph.id_of(word1), graph.id_of(word2), get_neighbors)) for word1, word2 in word_pairs
+        ]
+        results[name] = {
+            "total_s": round(time.perf_counter() - start, 3),
+            "mean_expansions": expansions / len(word_pairs),
+        }
+
+    d_graph = build_dijkstra_graph(graph)
+    start = time.perf_counter()
+    path_lengths_by_search["dijkstar"] = [len(find_shortest_word_chain(*pair, d_graph)) for pair in word_pairs]
+    results["dijkstar"] = {"total_s": round(time.perf_counter() - start, 3)}
+
+    assert all(lengths == path_lengths_by_search["dijkstar"] for lengths in path_lengths_by_search.values())
+    lengths = path_lengths_by_search["dijkstar"]
+    results["chains"] = {"mean_chain_length": sum(lengths) / len(lengths), "longest_chain": max(lengths)}
+    return results
+
+
+def benchmark_distances(vocab: VOCAB, word_length: int, samples: int = 200) -> t.Dict[str, dict]:
+    graph = build_compact_neighborhood_graph(vocab, word_length)
+    sources = random.Random(0).sample(graph.words, min(samples, len(graph)))
+
+    def python_bfs_eccentricity(word: str) -> int:
+        levels = {graph.id_of(word): 0}
+        queue = deque(levels)
+        while queue:
+            word_id = queue.popleft()
+            for neighbor_id in graph.neighbor_ids(word_id):
+                if neighbor_id not in levels:
+                    levels[neighbor_id] = levels[word_id] + 1
+                    queue.append(neighbor_id)
+        return max(levels.values())
+
+    start = time.perf_counter()
+    expected_eccentricities = {word: python_bfs_eccentricity(word) for word in sources}
+    python_bfs_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in sources:
+        distances.distances_from(graph, word)
+    distances_from_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in sources:
+        distances.neighbors_within(graph, word, 2)
+    neighbors_within_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert distances.eccentricities(graph, sources) == expected_eccentricities
+    sampled_sweep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    distribution = distances.chain_length_distribution(graph)
+    distribution_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    diameter, word1, word2 = distances.estimate_diameter(graph)
+    diameter_time = time.perf_counter() - start
+
+    return {
+        "graph": {"words": len(graph), "edges": graph.n_edges, "diameter": diameter, "hardest_pair": (word1, word2)},
+        # python queue per source, extrapolated to all sources
+        "single_source_python_bfs": {
+            "per_source_ms": 1000 * python_bfs_time / len(sources),
+            "all_sources_s": python_bfs_time / len(sources) * len(graph),
+        },
+        "single_source_level_synchronous": {"per_source_ms": 1000 * distances_from_time / len(sources)},
+        "neighbors_within_2": {"per_query_ms": 1000 * neighbors_within_time / len(sources)},
+        "bit_parallel": {
+            "per_source_ms": 1000 * sampled_sweep_time / len(sources),
+            "chain_length_distribution_s": distribution_time,
+            "exact_diameter_s": diameter_time,
+        },
+        "chain_length_distribution": distribution,
+    }
+
+
+def benchmark_edit_graph(vocab: VOCAB, samples: int = 200, pairs: int = 200) -> t.Dict[str, dict]:
+    words = collect_all_words(vocab)
+
+    start = time.perf_counter()
+    graph = build_edit_neighborhood_graph(words)
+    build_time = time.perf_counter() - start
+
+    # the naive extension of find_orthographic_neighborhood, every word compared to the whole vocab
+    rng = random.Random(0)
+    sampled_words = rng.sample(words, min(samples, len(words)))
+    start = time.perf_counter()
+    for word in sampled_words:
+        assert [w for w in words if check_edit_neighbor(word, w)] == graph[word]
+    scan_time = time.perf_counter() - start
+
+    largest_component = max(graph.components.component_sizes().items(), key=lambda item: item[1])[0]
+    component_words = [w for w in words if graph.components.component_of(w) == largest_component]
+    word_pairs = [tuple(rng.sample(component_words, 2)) for _ in range(pairs)]
+    start = time.perf_counter()
+    chains = [find_shortest_edit_chain(graph, *pair) for pair in word_pairs]
+    chain_time = time.perf_counter() - start
+
+    return {
+        "graph": {
+            "words": len(graph),
+            "edges": graph.n_edges,
+            "cross_length_edges": sum(len(w) != len(n) for w in sampled_words for n in graph[w]),
+            "largest_component": len(component_words),
+        },
+        "index_build": {"total_s": build_time},
+        "vocab_scan": {
+            "per_word_ms": 1000 * scan_time / len(sampled_words),
+            "all_words_s": scan_time / len(sampled_words) * len(words),
+        },
+        "edit_chains": {"per_pair_ms": 1000 * chain_time / pairs, "mean_chain_length": sum(map(len, chains)) / pairs},
+    }
+
+
+def benchmark_incremental_update(vocab: VOCAB, word_length: int, inserts: int = 1000) -> t.Dict[str, float]:
+    words = collect_words(vocab, word_length)
+    kept_words, inserted_words = words[:-inserts], words[-inserts:]
+    graph = MutableNeighborhoodGraph(build_compact_neighborhood_graph(kept_words, word_length))
+
+    start = time.perf_counter()
+    for word in inserted_words:
+        graph.add_word(word)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for word in inserted_words:
+        graph.remove_word(word)
+    remove_time = time.perf_counter() - start
+
+    return {
+        "inserts": len(inserted_words),
+        "incremental_insert_s": insert_time,
+        "incremental_remove_s": remove_time,
+        "full_rebuild_s": timeit.timeit(lambda: build_compact_neighborhood_graph(words, word_length), number=1),
+    }
+
+
+# the depth-first search before it was made iterative, kept as the baseline
+def _find_word_chain_recursive(
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, seen: t.Optional[set] = None
+) -> WORD_PATH:
+    seen = set() if seen is None else seen
+    seen.add(word1)
+    for neighbor in graph.get(word1, []):
+        if neighbor in seen:
+            continue
+
+        if neighbor == word2:
+            return [word1, word2]
+
+        path = _find_word_chain_recursive(neighbor, word2, graph, seen)
+        if path:
+            return [word1] + path
+
+    return []
+
+
+@contextlib.contextmanager
+def _working_directory(path: str) -> t.Iterator[None]:
+    # the graph cache lives in a cwd relative .graphs directory
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _read_vocab(word_list_path: t.Optional[pathlib.Path]) -> VOCAB:
+    if word_list_path is None:
+        return read_system_vocab()
+    return read_words(word_list_path)
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "benchmark",
+        choices=[
+            "cache-load",
+            "graph-representation",
+            "word-chain",
+            "incremental-update",
+            "shortest-path",
+            "distances",
+            "edit-graph",
+        ],
+    )
+    parser.add_argument("-f", "--word-list-file", type=pathlib.Path, help="Wordlist file path")
+    parser.add_argument("-l", "--word-length", type=int, default=5)
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    vocab = _read_vocab(args.word_list_file)
+
+    if args.benchmark == "cache-load":
+        for cache_format, result in benchmark_cache_load(vocab, args.word_length).items():
+            print(cache_format, result)
+    elif args.benchmark == "graph-representation":
+        for representation, result in benchmark_graph_representation(vocab, args.word_length).items():
+            print(representation, result)
+    elif args.benchmark == "word-chain":
+        for engine, result in benchmark_word_chain(vocab, args.word_length).items():
+            print(engine, result)
+    elif args.benchmark == "incremental-update":
+        print(benchmark_incremental_update(vocab, args.word_length))
+    elif args.benchmark == "shortest-path":
+        for search, result in benchmark_shortest_path(vocab, args.word_length).items():
+            print(search, result)
+    elif args.benchmark == "edit-graph":
+        for name, result in benchmark_edit_graph(vocab).items():
+            print(name, result)
+    elif args.benchmark == "distances":
+        for name, result in benchmark_distances(vocab, args.word_length).items():
+            print(name, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import argparse
+
+from metagrams.orthographic_neighborhood import read_system_vocab
+from metagrams.orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Warm up the .graphs cache for every word length")
+    parser.add_argument("-n", "--word-lengths", type=int, nargs="*", help="Word lengths, all by default")
+    parser.add_argument("-j", "--workers", type=int, help="Number of processes, one per CPU by default")
+    parser.add_argument("--no-cache", action="store_true", help="Rebuild graphs that are already cached")
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+
+    vocab = read_system_vocab()
+    builder = OrthographicNeighborhoodGraphBuilder(vocab)
+    built_lengths = builder.build_all(args.word_lengths, workers=args.workers, no_cache=args.no_cache)
+    print(f"built graphs for word lengths {built_lengths}")
+
+
+if __name__ == "__main__":
+    main()
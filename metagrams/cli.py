@@ -1,21 +1,33 @@
 import argparse
+from pathlib import Path
 
+from metagrams.compact_graph import SEARCHES
 from metagrams.metagram_graph import MetagramGraph
 from metagrams.orthographic_neighborhood import read_system_vocab
+from word_squeezer.word_list import read_words
 
 
 def get_args():
     parser = argparse.ArgumentParser()
     parser.add_argument("word1")
     parser.add_argument("word2")
+    parser.add_argument("-f", "--word-list-file", type=Path, help="Wordlist file path, the system word list by default")
+    parser.add_argument("-s", "--search", choices=SEARCHES, default="bfs", help="Shortest path search algorithm")
+    parser.add_argument(
+        "-e", "--edits", action="store_true", help="Allow adding and dropping letters, the words may differ in length"
+    )
     return parser.parse_args()
 
 
 def main():
     args = get_args()
 
-    vocab = read_system_vocab()
-    path = MetagramGraph(vocab).find_word_chain(args.word1, args.word2)
+    vocab = read_words(args.word_list_file) if args.word_list_file else read_system_vocab()
+    graph = MetagramGraph(vocab)
+    if args.edits:
+        path = graph.find_edit_chain(args.word1, args.word2)
+    else:
+        path = graph.find_word_chain(args.word1, args.word2, args.search)
     print(path)
 
 
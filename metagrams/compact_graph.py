@@ -0,0 +1,211 @@
+import typing as t
+from array import array
+
+from metagrams.components import ComponentIndex
+from metagrams.orthographic_neighborhood import (
+    VOCAB,
+    ORTHOGRAPHIC_NEIGHBORHOOD,
+    ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH,
+    WORD_PATH,
+    WILDCARD_INDEX,
+    a_star_search,
+    bidirectional_bfs,
+    build_wildcard_index,
+    hamming_distance,
+    iter_wildcard_patterns,
+)
+
+WORD_ID = int
+
+# bidirectional breadth-first search, or A* search with the letter difference count as heuristic
+SEARCHES = ("bfs", "a_star")
+
+
+class CompactNeighborhoodGraph(t.Mapping[str, ORTHOGRAPHIC_NEIGHBORHOOD]):
+    """Orthographic neighborhood graph over dense integer word ids.
+
+    Adjacency is stored CSR-style: the neighbor ids of word i are targets[offsets[i]:offsets[i + 1]].
+    The Mapping interface is a compatibility view, that decodes ids back to words on access,
+    so the graph can be passed wherever a dict of neighbor lists is expected.
+    """
+
+    def __init__(
+            self,
+            words: t.Sequence[str],
+            offsets: t.Sequence[int],
+            targets: t.Sequence[int],
+            word_ids: t.Optional[t.Mapping[str, WORD_ID]] = None,
+            component_labels: t.Optional[t.Sequence[int]] = None,
+    ):
+        self.words = words
+        self.offsets = offsets
+        self.targets = targets
+        self.word_ids = word_ids if word_ids is not None else {w: i for i, w in enumerate(words)}
+        self._components = ComponentIndex(self.word_ids, component_labels) if component_labels is not None else None
+
+    @classmethod
+    def from_graph(cls, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH) -> "CompactNeighborhoodGraph":
+        if isinstance(graph, cls):
+            return graph
+
+        words = list(graph)
+        word_ids = {w: i for i, w in enumerate(words)}
+
+        offsets = array("I", [0])
+        targets = array("I")
+        for word in words:
+            targets.extend(word_ids[neighbor] for neighbor in graph[word])
+            offsets.append(len(targets))
+
+        return cls(words, offsets, targets, word_ids)
+
+    @property
+    def n_edges(self) -> int:
+        return len(self.targets)
+
+    @property
+    def components(self) -> ComponentIndex:
+        if self._components is None:
+            self._components = ComponentIndex.from_graph(self)
+        return self._components
+
+    def id_of(self, word: str) -> WORD_ID:
+        return self.word_ids[word]
+
+    def neighbor_ids(self, word_id: WORD_ID) -> t.Sequence[WORD_ID]:
+        return self.targets[self.offsets[word_id]:self.offsets[word_id + 1]]
+
+    def find_shortest_word_chain(self, word1: str, word2: str, search: str = "bfs") -> WORD_PATH:
+        return find_shortest_word_chain_by_ids(self, word1, word2, search)
+
+    def __getitem__(self, word: str) -> ORTHOGRAPHIC_NEIGHBORHOOD:
+        words = self.words
+        return [words[i] for i in self.neighbor_ids(self.word_ids[word])]
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.word_ids
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.words)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+
+NEIGHBOR_SHARD = t.Tuple[array, array]
+
+
+def find_shortest_word_chain_by_ids(graph, word1: str, word2: str, search: str = "bfs") -> WORD_PATH:
+    """Shortest path search over the integer ids of a graph with a word table, id index and component index"""
+    if len(word1) != len(word2):
+        raise ValueError("metagrams must have the same length")
+    if search not in SEARCHES:
+        raise ValueError(f"search must be one of {SEARCHES}")
+    if not graph.components.are_connected(word1, word2) or word1 not in graph.word_ids:
+        return []
+
+    source, target = graph.word_ids[word1], graph.word_ids[word2]
+    if search == "a_star":
+        words = graph.words
+        path = a_star_search(source, target, graph.neighbor_ids, lambda i: hamming_distance(words[i], word2))
+    else:
+        path = bidirectional_bfs(source, target, graph.neighbor_ids)
+    return [graph.words[i] for i in path]
+
+
+def build_compact_neighborhood_graph(vocab: VOCAB, word_length: int) -> CompactNeighborhoodGraph:
+    words = collect_words(vocab, word_length)
+    return merge_neighbor_shards(words, [build_neighbor_shard(words, 0, len(words))])
+
+
+def collect_words(vocab: VOCAB, word_length: int) -> t.List[str]:
+    # duplicate words are collapsed, hence no word is listed twice as a neighbor
+    return list(dict.fromkeys(w for w in vocab if len(w) == word_length))
+
+
+def build_neighbor_shard(
+        words: t.List[str], start: int, stop: int, index: t.Optional[WILDCARD_INDEX] = None
+) -> NEIGHBOR_SHARD:
+    """Degrees and concatenated neighbor ids of words[start:stop], neighbors are looked up among all words.
+
+    Shards of the same words can share their wildcard index, it is built here if none is passed.
+    """
+    if index is None:
+        index = build_wildcard_index(words)
+
+    degrees = array("I")
+    targets = array("I")
+    for word_id in range(start, stop):
+        neighbor_ids = []
+        for pattern in iter_wildcard_patterns(words[word_id]):
+            neighbor_ids.extend(i for i in index[pattern] if i != word_id)
+        neighbor_ids.sort()
+        degrees.append(len(neighbor_ids))
+        targets.extend(neighbor_ids)
+
+    return degrees, targets
+
+
+def merge_neighbor_shards(words: t.List[str], shards: t.List[NEIGHBOR_SHARD]) -> CompactNeighborhoodGraph:
+    """Concatenates shards covering consecutive word ranges, in order"""
+    offsets = array("I", [0])
+    targets = array("I")
+    for shard_degrees, shard_targets in shards:
+        for degree in shard_degrees:
+            offsets.append(offsets[-1] + degree)
+        targets.extend(shard_targets)
+
+    return CompactNeighborhoodGraph(words, offsets, targets)
+
+
+def patch_compact_neighborhood_graph(
+        graph: CompactNeighborhoodGraph, words: t.List[str]
+) -> CompactNeighborhoodGraph:
+    """Rebases a graph onto a changed word list, equal to building the graph of the words from scratch.
+
+    Neighborhoods of kept words are carried over, only the added words are looked up,
+    by trying every letter of the alphabet at every position. The cost is proportional to
+    the graph size plus the number of added words, instead of a rebuild of the wildcard index.
+    """
+    word_ids = {w: i for i, w in enumerate(words)}
+
+    removed = len(words)
+    old_to_new = array("I", [word_ids.get(w, removed) for w in graph.words])
+
+    alphabet = set("".join(words))
+    added_neighbor_ids: t.Dict[WORD_ID, t.List[WORD_ID]] = {}
+    for word_id, word in enumerate(words):
+        if word in graph.word_ids:
+            continue
+
+        for neighbor_id in _find_neighbor_ids_by_substitution(word, word_ids, alphabet):
+            added_neighbor_ids.setdefault(word_id, []).append(neighbor_id)
+            # kept neighbors of an added word gain it as a neighbor, added ones find it on their own
+            if words[neighbor_id] in graph.word_ids:
+                added_neighbor_ids.setdefault(neighbor_id, []).append(word_id)
+
+    offsets = array("I", [0])
+    targets = array("I")
+    for word_id, word in enumerate(words):
+        old_id = graph.word_ids.get(word)
+        neighbor_ids = [] if old_id is None else [
+            old_to_new[i] for i in graph.neighbor_ids(old_id) if old_to_new[i] != removed
+        ]
+        neighbor_ids.extend(added_neighbor_ids.get(word_id, ()))
+        neighbor_ids.sort()
+        targets.extend(neighbor_ids)
+        offsets.append(len(targets))
+
+    return CompactNeighborhoodGraph(words, offsets, targets, word_ids)
+
+
+def _find_neighbor_ids_by_substitution(
+        word: str, word_ids: t.Mapping[str, WORD_ID], alphabet: t.Set[str]
+) -> t.Iterable[WORD_ID]:
+    for i, original_letter in enumerate(word):
+        for letter in alphabet:
+            if letter == original_letter:
+                continue
+            neighbor_id = word_ids.get(word[:i] + letter + word[i + 1:])
+            if neighbor_id is not None:
+                yield neighbor_id
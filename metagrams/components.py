@@ -0,0 +1,101 @@
+import typing as t
+from array import array
+from collections import Counter, deque
+
+COMPONENT_ID = int
+
+
+class ComponentIndex:
+    """Connected component label of every word, answers "is there any chain at all" in constant time"""
+
+    def __init__(self, word_ids: t.Mapping[str, int], labels: t.Sequence[COMPONENT_ID]):
+        self._word_ids = word_ids
+        self.labels = labels
+        self._sizes: t.Optional[t.Counter[COMPONENT_ID]] = None
+        self._next_component_id: t.Optional[COMPONENT_ID] = None
+
+    @classmethod
+    def from_graph(cls, graph) -> "ComponentIndex":
+        """Labels components with a single breadth-first sweep over a CompactNeighborhoodGraph"""
+        unlabeled = len(graph)
+        labels = array("I", [unlabeled]) * len(graph)
+
+        component_id = 0
+        for source in range(len(graph)):
+            if labels[source] != unlabeled:
+                continue
+
+            labels[source] = component_id
+            queue = deque([source])
+            while queue:
+                for neighbor in graph.neighbor_ids(queue.popleft()):
+                    if labels[neighbor] == unlabeled:
+                        labels[neighbor] = component_id
+                        queue.append(neighbor)
+            component_id += 1
+
+        return cls(graph.word_ids, labels)
+
+    def component_of(self, word: str) -> t.Optional[COMPONENT_ID]:
+        word_id = self._word_ids.get(word)
+        return None if word_id is None else self.labels[word_id]
+
+    def are_connected(self, word1: str, word2: str) -> bool:
+        if word1 == word2:
+            return True
+
+        component = self.component_of(word1)
+        return component is not None and component == self.component_of(word2)
+
+    def component_size(self, word: str) -> int:
+        component = self.component_of(word)
+        return 0 if component is None else self.component_sizes()[component]
+
+    def component_sizes(self) -> t.Counter[COMPONENT_ID]:
+        if self._sizes is None:
+            if len(self._word_ids) == len(self.labels):
+                self._sizes = Counter(self.labels)
+            else:  # labels of removed word ids are left behind in a mutable graph
+                self._sizes = Counter(self.labels[i] for i in self._word_ids.values())
+        return self._sizes
+
+    def relabel(self, word_ids: t.Iterable[int], component: COMPONENT_ID) -> None:
+        """Moves words to another component, for graphs that are updated in place"""
+        for word_id in word_ids:
+            self._count(self.labels[word_id], -1)
+            self.labels[word_id] = component
+            self._count(component, 1)
+
+    def append(self, component: COMPONENT_ID) -> None:
+        """Labels the next word id, after it was added to the word ids"""
+        self.labels.append(component)
+        self._count(component, 1)
+
+    def discard(self, word_id: int) -> None:
+        """Forgets a word id, after it was removed from the word ids. Its label is left behind"""
+        self._count(self.labels[word_id], -1)
+
+    def _count(self, component: COMPONENT_ID, delta: int) -> None:
+        # keep the component sizes up to date, if they were computed already
+        if self._sizes is None:
+            return
+        self._sizes[component] += delta
+        if not self._sizes[component]:
+            del self._sizes[component]
+
+    def new_component_id(self) -> COMPONENT_ID:
+        if self._next_component_id is None:
+            self._next_component_id = max(self.labels, default=-1) + 1
+        self._next_component_id += 1
+        return self._next_component_id - 1
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        sizes = self.component_sizes()
+        return {
+            "words": len(self._word_ids),
+            "components": len(sizes),
+            "largest_component": max(sizes.values(), default=0),
+            "isolated_words": sum(1 for size in sizes.values() if size == 1),
+            # component size -> number of components of that size
+            "size_distribution": dict(sorted(Counter(sizes.values()).items())),
+        }
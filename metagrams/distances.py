@@ -0,0 +1,163 @@
+import typing as t
+
+try:
+    import numpy as np
+except ImportError:  # optional, pip install numpy
+    np = None
+
+from metagrams.compact_graph import CompactNeighborhoodGraph
+
+# sources swept together by the bit-parallel search, a bit per source in rows of 64 bit words.
+# the edge gather of a level takes n_edges * _SOURCES_PER_SWEEP / 8 bytes
+_SOURCES_PER_SWEEP = 1024
+
+UNREACHABLE = -1
+
+# set bits of every byte value, for numpy versions before 2 that lack np.bitwise_count
+_BYTE_BIT_COUNTS = None if np is None else np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+WORD_DISTANCES = t.Dict[str, int]
+DIAMETER = t.Tuple[int, str, str]
+
+
+def distances_from(graph: CompactNeighborhoodGraph, word: str, max_distance: t.Optional[int] = None) -> "np.ndarray":
+    """Chain length, in letter changes, from the word to every word id, UNREACHABLE outside its component.
+
+    The search is level-synchronous, each level gathers the neighbors of the whole frontier at once.
+    With max_distance the search stops at that level, and farther words are left UNREACHABLE.
+    """
+    offsets, targets = _csr_arrays(graph)
+    distances = np.full(len(graph), UNREACHABLE, dtype=np.int32)
+
+    source = graph.id_of(word)
+    distances[source] = 0
+    frontier = np.array([source], dtype=np.intp)
+    level = 0
+    while len(frontier) and (max_distance is None or level < max_distance):
+        level += 1
+        neighbor_ids = targets[_edge_ranges(offsets, frontier)]
+        frontier = np.unique(neighbor_ids[distances[neighbor_ids] == UNREACHABLE])
+        distances[frontier] = level
+
+    return distances
+
+
+def neighbors_within(graph: CompactNeighborhoodGraph, word: str, k: int) -> WORD_DISTANCES:
+    """Words at most k letter changes away from the word, mapped to their distance, nearest first.
+
+    The word itself is not included, an unknown word has no neighbors.
+    """
+    if word not in graph:
+        return {}
+
+    distances = distances_from(graph, word, max_distance=k)
+    word_ids = np.flatnonzero(distances > 0)
+    # stable, so words at the same distance stay in id order
+    word_ids = word_ids[np.argsort(distances[word_ids], kind="stable")]
+    return {graph.words[int(i)]: int(distances[i]) for i in word_ids}
+
+
+def eccentricities(graph: CompactNeighborhoodGraph, words: t.Optional[t.Iterable[str]] = None) -> WORD_DISTANCES:
+    """Longest shortest chain from each word to any word of its component, of all words by default"""
+    source_ids = _source_ids(graph, words)
+    result = np.zeros(len(source_ids), dtype=np.int32)
+    for start, sweep_eccentricities, _ in _sweep_sources(graph, source_ids):
+        result[start:start + len(sweep_eccentricities)] = sweep_eccentricities
+
+    return {graph.words[int(i)]: int(e) for i, e in zip(source_ids, result)}
+
+
+def chain_length_distribution(graph: CompactNeighborhoodGraph) -> t.Dict[int, int]:
+    """Number of word pairs by the length of their shortest chain, in letter changes.
+
+    Each connected pair is counted once, pairs in different components have no chain and are not counted.
+    """
+    pair_counts: t.Dict[int, int] = {}
+    for _, _, level_counts in _sweep_sources(graph, np.arange(len(graph), dtype=np.intp)):
+        for level, count in enumerate(level_counts, start=1):
+            pair_counts[level] = pair_counts.get(level, 0) + count
+
+    # every pair is reached once from either end
+    return {level: count // 2 for level, count in pair_counts.items()}
+
+
+def estimate_diameter(graph: CompactNeighborhoodGraph, words: t.Optional[t.Iterable[str]] = None) -> DIAMETER:
+    """Longest shortest chain in the graph, and a pair of words it connects.
+
+    The eccentricities of all words give the exact diameter. The eccentricities of a sample of words
+    give a lower bound, which is usually tight if the sample includes peripheral words.
+    """
+    source_eccentricities = eccentricities(graph, words)
+    if not source_eccentricities:
+        raise ValueError("the diameter of an empty graph is undefined")
+
+    word1 = max(source_eccentricities, key=source_eccentricities.__getitem__)
+    distances = distances_from(graph, word1)
+    return source_eccentricities[word1], word1, graph.words[int(np.argmax(distances))]
+
+
+def _sweep_sources(
+        graph: CompactNeighborhoodGraph, source_ids: "np.ndarray"
+) -> t.Iterator[t.Tuple[int, "np.ndarray", t.List[int]]]:
+    """Bit-parallel breadth-first search from batches of sources.
+
+    Every word carries a bitset of the sources that reached it, a level ORs the bitsets of
+    the frontier into their neighbors. Yields the batch start, the eccentricities of the batch
+    sources and the number of (source, word) pairs first reached at each level.
+    """
+    offsets, targets = _csr_arrays(graph)
+    # ranges of words without neighbors are skipped, reduceat does not reduce empty ranges
+    has_neighbors = offsets[1:] > offsets[:-1]
+    range_starts = offsets[:-1][has_neighbors]
+
+    for start in range(0, len(source_ids), _SOURCES_PER_SWEEP):
+        batch = source_ids[start:start + _SOURCES_PER_SWEEP]
+        bits = np.arange(len(batch))
+        reached = np.zeros((len(graph), -(-len(batch) // 64)), dtype=np.uint64)
+        reached[batch, bits // 64] = np.left_shift(np.uint64(1), (bits % 64).astype(np.uint64))
+
+        batch_eccentricities = np.zeros(len(batch), dtype=np.int32)
+        level_counts = []
+        frontier = reached.copy()
+        while len(targets):
+            expanded = np.zeros_like(reached)
+            expanded[has_neighbors] = np.bitwise_or.reduceat(frontier[targets], range_starts, axis=0)
+            frontier = expanded & ~reached
+            if not frontier.any():
+                break
+
+            reached |= frontier
+            level_counts.append(_count_bits(frontier))
+            # sources that still reach new words are at least this eccentric
+            source_bits = np.bitwise_or.reduce(frontier, axis=0).astype("<u8").view(np.uint8)
+            still_reaching = np.unpackbits(source_bits, bitorder="little")[:len(batch)].astype(bool)
+            batch_eccentricities[still_reaching] = len(level_counts)
+
+        yield start, batch_eccentricities, level_counts
+
+
+def _count_bits(bitsets: "np.ndarray") -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(bitsets).sum())
+    return int(_BYTE_BIT_COUNTS[bitsets.view(np.uint8)].sum())
+
+
+def _source_ids(graph: CompactNeighborhoodGraph, words: t.Optional[t.Iterable[str]]) -> "np.ndarray":
+    if words is None:
+        return np.arange(len(graph), dtype=np.intp)
+    # duplicates would share a bit of the bitsets
+    return np.array(list(dict.fromkeys(graph.id_of(w) for w in words)), dtype=np.intp)
+
+
+def _csr_arrays(graph: CompactNeighborhoodGraph) -> t.Tuple["np.ndarray", "np.ndarray"]:
+    if np is None:
+        raise ImportError("word distances require numpy")
+    return np.asarray(graph.offsets, dtype=np.intp), np.asarray(graph.targets, dtype=np.intp)
+
+
+def _edge_ranges(offsets: "np.ndarray", word_ids: "np.ndarray") -> "np.ndarray":
+    """Concatenated edge indices of the words, offsets[i]..offsets[i + 1] - 1 for every word i"""
+    starts, stops = offsets[word_ids], offsets[word_ids + 1]
+    lengths = stops - starts
+    # position within the concatenation, shifted to the start of the word's range
+    return np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
@@ -0,0 +1,72 @@
+import typing as t
+from array import array
+
+from metagrams.compact_graph import WORD_ID, CompactNeighborhoodGraph
+from metagrams.orthographic_neighborhood import (
+    VOCAB,
+    WORD_PATH,
+    WILDCARD_INDEX,
+    bidirectional_bfs,
+    build_wildcard_index,
+    check_edit_neighbor,
+    iter_wildcard_patterns,
+)
+
+
+def build_edit_neighborhood_graph(vocab: VOCAB) -> CompactNeighborhoodGraph:
+    """Neighborhood graph of single letter substitutions, insertions and deletions over words of all lengths.
+
+    Neighbors are at Levenshtein distance 1, every neighbor is found by hash lookups in the index of
+    single letter deletions, which the substitution graph builds already: substitutions share a deletion,
+    a deletion of the word is a word of the vocab, and the word itself is a deletion of the words it can
+    grow into (symmetric deletion).
+    """
+    words = collect_all_words(vocab)
+    word_ids = {w: i for i, w in enumerate(words)}
+    index = build_wildcard_index(words)
+
+    offsets = array("I", [0])
+    targets = array("I")
+    for word_id, word in enumerate(words):
+        neighbor_ids = set(find_edit_neighbor_ids(word, word_ids, index))
+        neighbor_ids.discard(word_id)
+        targets.extend(sorted(neighbor_ids))
+        offsets.append(len(targets))
+
+    return CompactNeighborhoodGraph(words, offsets, targets, word_ids)
+
+
+# exhaustive O(n^2) reference implementation, kept for cross-checking the indexed one
+def build_edit_neighborhood_graph_brute_force(vocab: VOCAB) -> t.Dict[str, t.List[str]]:
+    words = collect_all_words(vocab)
+    return {w: [candidate for candidate in words if check_edit_neighbor(w, candidate)] for w in words}
+
+
+def collect_all_words(vocab: VOCAB) -> t.List[str]:
+    return list(dict.fromkeys(w for w in vocab if w))
+
+
+def find_edit_neighbor_ids(
+        word: str, word_ids: t.Mapping[str, WORD_ID], index: WILDCARD_INDEX
+) -> t.Iterable[WORD_ID]:
+    """Ids of the words a single letter edit away, may repeat and include the word itself"""
+    for pattern in iter_wildcard_patterns(word):
+        # substitutions, the pattern letters of a word are one shorter, so only same length words share it
+        yield from index[pattern]
+        # deletions
+        deletion_id = word_ids.get(pattern[1])
+        if deletion_id is not None:
+            yield deletion_id
+
+    # insertions, the word is the pattern of a longer word, with a letter knocked out at any of len + 1 positions
+    for i in range(len(word) + 1):
+        yield from index.get((i, word), ())
+
+
+def find_shortest_edit_chain(graph: CompactNeighborhoodGraph, word1: str, word2: str) -> WORD_PATH:
+    """Shortest chain of single letter edits, the words may have different lengths"""
+    if not graph.components.are_connected(word1, word2) or word1 not in graph.word_ids:
+        return []
+
+    path = bidirectional_bfs(graph.word_ids[word1], graph.word_ids[word2], graph.neighbor_ids)
+    return [graph.words[i] for i in path]
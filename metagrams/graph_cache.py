@@ -0,0 +1,171 @@
+"""Compact binary on-disk format for orthographic neighborhood graphs.
+
+Layout, all integers are unsigned 32 bit in native byte order (the cache is machine-local):
+
+    header        magic, format version, word count, edge count, word blob size, vocab hash, build time
+    word offsets  n_words + 1 offsets into the word blob
+    word blob     utf-8 encoded words, concatenated
+    sorted ids    word ids ordered by their utf-8 bytes, for binary search lookups
+    adj offsets   n_words + 1 offsets into the adjacency targets (CSR)
+    adj targets   neighbor word ids
+    components    connected component id of every word
+
+Every section starts at a 4 byte boundary, so it can be cast straight out of an mmap.
+"""
+import hashlib
+import mmap
+import pathlib
+import struct
+import typing as t
+from array import array
+from dataclasses import dataclass
+
+from metagrams.compact_graph import CompactNeighborhoodGraph
+from metagrams.orthographic_neighborhood import ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
+
+MAGIC = b"METAGRPH"
+FORMAT_VERSION = 3
+
+_HEADER = struct.Struct("=8sIIII16sd")
+_UINT32 = "I"
+
+
+@dataclass
+class CacheMetadata:
+    vocab_hash: bytes
+    word_count: int
+    build_time: float  # unix timestamp
+
+
+def compute_vocab_hash(vocab: t.Iterable[str]) -> bytes:
+    digest = hashlib.blake2b(digest_size=16)
+    for word in vocab:
+        digest.update(word.encode())
+        digest.update(b"\n")
+    return digest.digest()
+
+
+def dump_binary_graph(
+        graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, path: pathlib.Path, metadata: CacheMetadata
+) -> None:
+    graph = CompactNeighborhoodGraph.from_graph(graph)
+    encoded_words = [word.encode() for word in graph.words]
+
+    word_offsets = array(_UINT32, [0])
+    for encoded_word in encoded_words:
+        word_offsets.append(word_offsets[-1] + len(encoded_word))
+    word_blob = b"".join(encoded_words)
+
+    sorted_ids = array(_UINT32, sorted(range(len(encoded_words)), key=encoded_words.__getitem__))
+
+    with path.open("wb") as f:
+        f.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, len(graph), graph.n_edges, len(word_blob), metadata.vocab_hash, metadata.build_time
+        ))
+        f.write(word_offsets.tobytes())
+        f.write(word_blob)
+        f.write(bytes(_padding(len(word_blob))))
+        f.write(sorted_ids.tobytes())
+        f.write(array(_UINT32, graph.offsets).tobytes())
+        f.write(array(_UINT32, graph.targets).tobytes())
+        f.write(array(_UINT32, graph.components.labels).tobytes())
+
+
+def read_binary_graph_metadata(path: pathlib.Path) -> CacheMetadata:
+    with path.open("rb") as f:
+        n_words, _, _, vocab_hash, build_time = _unpack_header(f.read(_HEADER.size))
+    return CacheMetadata(vocab_hash, n_words, build_time)
+
+
+def load_binary_graph(path: pathlib.Path) -> CompactNeighborhoodGraph:
+    """Maps the cache file, only the pages touched by lookups are read from disk"""
+    with path.open("rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    n_words, n_edges, blob_size, _, _ = _unpack_header(buffer[:_HEADER.size])
+
+    view = memoryview(buffer)
+    position = _HEADER.size
+
+    def take(size: int) -> memoryview:
+        nonlocal position
+        section = view[position:position + size]
+        position += size + _padding(size)
+        return section
+
+    word_offsets = take(4 * (n_words + 1)).cast(_UINT32)
+    word_blob = take(blob_size)
+    sorted_ids = take(4 * n_words).cast(_UINT32)
+    adj_offsets = take(4 * (n_words + 1)).cast(_UINT32)
+    adj_targets = take(4 * n_edges).cast(_UINT32)
+    component_labels = take(4 * n_words).cast(_UINT32)
+
+    words = _WordTable(word_offsets, word_blob)
+    return CompactNeighborhoodGraph(
+        words, adj_offsets, adj_targets, _SortedWordIndex(words, sorted_ids), component_labels
+    )
+
+
+def _unpack_header(data: bytes) -> t.Tuple[int, int, int, bytes, float]:
+    if len(data) < _HEADER.size:
+        raise ValueError("truncated graph cache file")
+
+    magic, version, n_words, n_edges, blob_size, vocab_hash, build_time = _HEADER.unpack(data)
+    if magic != MAGIC:
+        raise ValueError("not a metagram graph cache file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported graph cache version {version}, expected {FORMAT_VERSION}")
+
+    return n_words, n_edges, blob_size, vocab_hash, build_time
+
+
+def _padding(size: int) -> int:
+    return -size % 4
+
+
+class _WordTable(t.Sequence[str]):
+    """Word id to word view over the mapped word blob, words are decoded on access"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, word_id: int) -> str:
+        return self.encoded(word_id).decode()
+
+    def encoded(self, word_id: int) -> bytes:
+        return bytes(self._blob[self._offsets[word_id]:self._offsets[word_id + 1]])
+
+
+class _SortedWordIndex(t.Mapping[str, int]):
+    """Word to word id lookup by binary search over the mapped sorted ids, no dict has to be built on load"""
+
+    def __init__(self, words: _WordTable, sorted_ids: memoryview):
+        self._words = words
+        self._sorted_ids = sorted_ids
+
+    def __getitem__(self, word: str) -> int:
+        if not isinstance(word, str):
+            raise KeyError(word)
+
+        encoded_word = word.encode()
+        low, high = 0, len(self._sorted_ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self._words.encoded(self._sorted_ids[middle]) < encoded_word:
+                low = middle + 1
+            else:
+                high = middle
+
+        if low < len(self._sorted_ids) and self._words.encoded(self._sorted_ids[low]) == encoded_word:
+            return self._sorted_ids[low]
+        raise KeyError(word)
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._words)
+
+    def __len__(self) -> int:
+        return len(self._sorted_ids)
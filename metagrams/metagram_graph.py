@@ -1,20 +1,156 @@
-from metagrams.orthographic_neighborhood import (
-    find_shortest_word_chain,
-    build_dijkstra_graph,
-)
+import typing as t
+from collections import OrderedDict
+
+from metagrams import distances
+from metagrams.compact_graph import CompactNeighborhoodGraph
+from metagrams.edit_graph import find_shortest_edit_chain
+from metagrams.mutable_graph import MutableNeighborhoodGraph
 from metagrams.orthographic_neighborhood import VOCAB, WORD_PATH
 from metagrams.orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
 
+WORD_PAIR = t.Tuple[str, str]
+NEIGHBORHOOD_GRAPH = t.Union[CompactNeighborhoodGraph, MutableNeighborhoodGraph]
+
 
 class MetagramGraph:
-    def __init__(self, vocab: VOCAB):
-        self._graph_builder = OrthographicNeighborhoodGraphBuilder(vocab)
+    """Answers word chain queries, keeping the graphs of the most recently used word lengths in memory"""
+
+    def __init__(self, vocab: VOCAB, max_resident_lengths: t.Optional[int] = 8):
+        if max_resident_lengths is not None and max_resident_lengths < 1:
+            raise ValueError("at least one graph must stay resident")
+
+        # an ordered set, so words can be added and removed in constant time,
+        # the builder sees the live keys view and the cache hash follows the updates
+        self._vocab = dict.fromkeys(vocab)
+        self._graph_builder = OrthographicNeighborhoodGraphBuilder(self._vocab.keys())
+        self._max_resident_lengths = max_resident_lengths
+        self._graphs: t.OrderedDict[int, NEIGHBORHOOD_GRAPH] = OrderedDict()
+        # word lengths of graphs updated in memory, but not in the cache yet
+        self._unsaved_lengths: t.Set[int] = set()
+        # graph of single letter edits across all word lengths, built on first use
+        self._edit_graph: t.Optional[CompactNeighborhoodGraph] = None
+        # contiguous copies of graphs updated in place, for the distance searches,
+        # kept along with the graph they were flattened from until the next update
+        self._flattened_graphs: t.Dict[int, t.Tuple[MutableNeighborhoodGraph, CompactNeighborhoodGraph]] = {}
 
-    def find_word_chain(self, word1: str, word2: str) -> WORD_PATH:
+    def find_word_chain(self, word1: str, word2: str, search: str = "bfs") -> WORD_PATH:
+        """Shortest word chain, search is one of compact_graph.SEARCHES"""
         if len(word1) != len(word2):
             raise ValueError("metagrams must have the same length")
 
-        graph = self._graph_builder.build_graph(word_length=len(word1))
-        d_graph = build_dijkstra_graph(graph)
+        graph = self._get_graph(word_length=len(word1))
+
+        return graph.find_shortest_word_chain(word1, word2, search)
+
+    def find_edit_chain(self, word1: str, word2: str) -> WORD_PATH:
+        """Shortest word chain, where a step may also insert or delete a letter, so the words may differ in length"""
+        if self._edit_graph is None:
+            self._edit_graph = self._graph_builder.build_edit_graph()
+
+        return find_shortest_edit_chain(self._edit_graph, word1, word2)
+
+    def is_word_chain(self, word1: str, word2: str) -> bool:
+        if len(word1) != len(word2):
+            return False
+
+        return self._get_graph(word_length=len(word1)).components.are_connected(word1, word2)
+
+    def component_stats(self, word_length: int) -> t.Dict[str, t.Any]:
+        return self._get_graph(word_length).components.stats()
+
+    def neighbors_within(self, word: str, k: int) -> distances.WORD_DISTANCES:
+        """Words at most k letter changes away from the word, mapped to their distance, nearest first"""
+        return distances.neighbors_within(self._get_compact_graph(len(word)), word, k)
+
+    def chain_length_distribution(self, word_length: int) -> t.Dict[int, int]:
+        """Number of word pairs of the word length by the length of their shortest chain"""
+        return distances.chain_length_distribution(self._get_compact_graph(word_length))
+
+    def estimate_diameter(self, word_length: int, words: t.Optional[t.Iterable[str]] = None) -> distances.DIAMETER:
+        """Longest shortest chain of the word length and its end words, exact unless a sample of words is given"""
+        return distances.estimate_diameter(self._get_compact_graph(word_length), words)
+
+    def add_word(self, word: str) -> bool:
+        """Adds a word to the vocab and its graph, returns False if the word is known already"""
+        if word in self._vocab:
+            return False
+
+        self._get_mutable_graph(len(word)).add_word(word)
+        self._vocab[word] = None
+        self._edit_graph = None
+        self._flattened_graphs.pop(len(word), None)
+        self._unsaved_lengths.add(len(word))
+        return True
+
+    def remove_word(self, word: str) -> bool:
+        """Removes a word from the vocab and its graph, returns False if the word is unknown"""
+        if word not in self._vocab:
+            return False
+
+        self._get_mutable_graph(len(word)).remove_word(word)
+        del self._vocab[word]
+        self._edit_graph = None
+        self._flattened_graphs.pop(len(word), None)
+        self._unsaved_lengths.add(len(word))
+        return True
+
+    def save(self) -> None:
+        """Writes graphs updated by add_word/remove_word to the cache"""
+        for word_length in sorted(self._unsaved_lengths):
+            self._save_graph(word_length, self._graphs[word_length])
+
+    def find_word_chains(self, pairs: t.Iterable[WORD_PAIR]) -> t.List[WORD_PATH]:
+        """Batch version of find_word_chain, the paths are returned in the order of the pairs"""
+        pairs = list(pairs)
+        if any(len(word1) != len(word2) for word1, word2 in pairs):
+            raise ValueError("metagrams must have the same length")
+
+        # group by length, so each graph is fetched once even if it does not stay resident
+        pair_indices_by_length: t.Dict[int, t.List[int]] = {}
+        for i, (word1, _) in enumerate(pairs):
+            pair_indices_by_length.setdefault(len(word1), []).append(i)
+
+        paths: t.List[WORD_PATH] = [[] for _ in pairs]
+        for word_length, pair_indices in pair_indices_by_length.items():
+            graph = self._get_graph(word_length)
+            for i in pair_indices:
+                paths[i] = graph.find_shortest_word_chain(*pairs[i])
+
+        return paths
+
+    def _get_graph(self, word_length: int) -> NEIGHBORHOOD_GRAPH:
+        if word_length in self._graphs:
+            self._graphs.move_to_end(word_length)
+            return self._graphs[word_length]
+
+        graph = self._graph_builder.build_graph(word_length=word_length)
+        self._graphs[word_length] = graph
+        if self._max_resident_lengths is not None and len(self._graphs) > self._max_resident_lengths:
+            evicted_length, evicted_graph = self._graphs.popitem(last=False)
+            self._flattened_graphs.pop(evicted_length, None)
+            if evicted_length in self._unsaved_lengths:
+                self._save_graph(evicted_length, evicted_graph)
+
+        return graph
+
+    def _get_compact_graph(self, word_length: int) -> CompactNeighborhoodGraph:
+        graph = self._get_graph(word_length)
+        if isinstance(graph, CompactNeighborhoodGraph):
+            return graph
+
+        # the searches need contiguous adjacency, a graph updated in place is flattened once per update
+        source_graph, flattened_graph = self._flattened_graphs.get(word_length, (None, None))
+        if source_graph is not graph:
+            flattened_graph = CompactNeighborhoodGraph.from_graph(graph)
+            self._flattened_graphs[word_length] = graph, flattened_graph
+        return flattened_graph
+
+    def _get_mutable_graph(self, word_length: int) -> MutableNeighborhoodGraph:
+        graph = self._get_graph(word_length)
+        if not isinstance(graph, MutableNeighborhoodGraph):
+            graph = self._graphs[word_length] = MutableNeighborhoodGraph(graph)
+        return graph
 
-        return find_shortest_word_chain(word1, word2, d_graph)
+    def _save_graph(self, word_length: int, graph: NEIGHBORHOOD_GRAPH) -> None:
+        self._graph_builder.save_graph(graph, word_length)
+        self._unsaved_lengths.discard(word_length)
@@ -0,0 +1,169 @@
+import typing as t
+from array import array
+from collections import deque
+
+from metagrams.compact_graph import WORD_ID, CompactNeighborhoodGraph, find_shortest_word_chain_by_ids
+from metagrams.components import ComponentIndex
+from metagrams.orthographic_neighborhood import (
+    ORTHOGRAPHIC_NEIGHBORHOOD,
+    WORD_PATH,
+    bidirectional_bfs,
+    build_wildcard_index,
+    iter_wildcard_patterns,
+)
+
+
+class MutableNeighborhoodGraph(t.Mapping[str, ORTHOGRAPHIC_NEIGHBORHOOD]):
+    """Neighborhood graph of a single word length, that can be updated in place.
+
+    Words keep the ids of the graph they were copied from, new words get the next free id,
+    and ids of removed words are not reused. Neighbors are kept in id order, so the graph stays
+    equal to a graph built from the vocab with removed words dropped and added words appended.
+    A wildcard pattern index finds the neighborhood of a word without scanning the vocab.
+    """
+
+    def __init__(self, graph: CompactNeighborhoodGraph):
+        self.words: t.List[t.Optional[str]] = list(graph.words)
+        self.word_ids: t.Dict[str, WORD_ID] = {w: i for i, w in enumerate(self.words)}
+        # ordered sets of neighbor ids
+        self._adjacency: t.List[t.Optional[t.Dict[WORD_ID, None]]] = [
+            dict.fromkeys(graph.neighbor_ids(i)) for i in range(len(graph))
+        ]
+        self._index = build_wildcard_index(self.words)
+        self.components = ComponentIndex(self.word_ids, array("I", graph.components.labels))
+
+    def add_word(self, word: str) -> bool:
+        """Returns False if the word is already in the graph"""
+        if word in self.word_ids:
+            return False
+
+        word_id = len(self.words)
+        neighbor_ids = []
+        for pattern in iter_wildcard_patterns(word):
+            bucket = self._index.setdefault(pattern, [])
+            neighbor_ids.extend(bucket)
+            bucket.append(word_id)
+        neighbor_ids.sort()
+
+        # neighboring components are merged before the word is registered, it joins the merged one
+        component = self._merge_components(neighbor_ids)
+
+        self.words.append(word)
+        self.word_ids[word] = word_id
+        self._adjacency.append(dict.fromkeys(neighbor_ids))
+        for neighbor_id in neighbor_ids:
+            self._adjacency[neighbor_id][word_id] = None
+        self.components.append(component)
+        return True
+
+    def remove_word(self, word: str) -> bool:
+        """Returns False if the word is not in the graph"""
+        word_id = self.word_ids.pop(word, None)
+        if word_id is None:
+            return False
+
+        for pattern in iter_wildcard_patterns(word):
+            self._index[pattern].remove(word_id)
+
+        neighbor_ids = list(self._adjacency[word_id])
+        for neighbor_id in neighbor_ids:
+            del self._adjacency[neighbor_id][word_id]
+        self.words[word_id] = None
+        self._adjacency[word_id] = None
+        self.components.discard(word_id)
+
+        self._split_component(neighbor_ids)
+        return True
+
+    def neighbor_ids(self, word_id: WORD_ID) -> t.Iterable[WORD_ID]:
+        return self._adjacency[word_id]
+
+    def find_shortest_word_chain(self, word1: str, word2: str, search: str = "bfs") -> WORD_PATH:
+        return find_shortest_word_chain_by_ids(self, word1, word2, search)
+
+    def _merge_components(self, neighbor_ids: t.List[WORD_ID]) -> int:
+        # the smaller neighboring components are relabeled into the largest one
+        labels = self.components.labels
+        sizes = self.components.component_sizes()
+        component_members = {labels[i]: i for i in neighbor_ids}
+        neighbor_components = sorted(component_members, key=sizes.__getitem__, reverse=True)
+        if not neighbor_components:
+            return self.components.new_component_id()
+
+        component = neighbor_components[0]
+        for other_component in neighbor_components[1:]:
+            piece = list(self._sweep_component(component_members[other_component], other_component))
+            self.components.relabel(piece, component)
+        return component
+
+    def _split_component(self, neighbor_ids: t.List[WORD_ID]) -> None:
+        # the component may fall apart, but the neighbors usually stay connected through a short detour,
+        # which a bidirectional search finds without visiting the whole component
+        if len(neighbor_ids) < 2:
+            return
+
+        labels = self.components.labels
+        component = labels[neighbor_ids[0]]
+
+        def component_neighbor_ids(word_id: WORD_ID) -> t.Iterable[WORD_ID]:
+            return (i for i in self._adjacency[word_id] if labels[i] == component)
+
+        # every neighbor still labeled with the component is connected to the representative
+        representative = neighbor_ids[0]
+        for neighbor_id in neighbor_ids[1:]:
+            if labels[neighbor_id] != component:
+                continue  # already moved along with a split off piece
+            if bidirectional_bfs(representative, neighbor_id, component_neighbor_ids):
+                continue
+
+            # the smaller piece gets a new label, found by sweeping both pieces in lockstep
+            smaller_piece, smaller_piece_source = self._first_exhausted(
+                self._sweep_component(representative, component),
+                self._sweep_component(neighbor_id, component),
+                representative,
+                neighbor_id,
+            )
+            if smaller_piece_source == representative:
+                representative = neighbor_id
+            self.components.relabel(smaller_piece, self.components.new_component_id())
+
+    @staticmethod
+    def _first_exhausted(
+            piece: t.Iterator[WORD_ID], other_piece: t.Iterator[WORD_ID], source: WORD_ID, other_source: WORD_ID
+    ) -> t.Tuple[t.List[WORD_ID], WORD_ID]:
+        visited, other_visited = [], []
+        while True:
+            word_id = next(piece, None)
+            if word_id is None:
+                return visited, source
+            visited.append(word_id)
+
+            word_id = next(other_piece, None)
+            if word_id is None:
+                return other_visited, other_source
+            other_visited.append(word_id)
+
+    def _sweep_component(self, source: WORD_ID, component: int) -> t.Iterator[WORD_ID]:
+        """Words reachable from source through words labeled with the component"""
+        labels = self.components.labels
+        seen = {source}
+        queue = deque([source])
+        while queue:
+            word_id = queue.popleft()
+            yield word_id
+            for neighbor_id in self._adjacency[word_id]:
+                if neighbor_id not in seen and labels[neighbor_id] == component:
+                    seen.add(neighbor_id)
+                    queue.append(neighbor_id)
+
+    def __getitem__(self, word: str) -> ORTHOGRAPHIC_NEIGHBORHOOD:
+        return [self.words[i] for i in self._adjacency[self.word_ids[word]]]
+
+    def __contains__(self, word: object) -> bool:
+        return word in self.word_ids
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.word_ids)
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
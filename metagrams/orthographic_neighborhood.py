@@ -1,22 +1,43 @@
+import heapq
+import itertools
 import typing as t
 from collections import deque
-import sys
 
 from dijkstar import Graph as DijkstarGraph, find_path, NoPathError
+from word_squeezer.word_list import find_system_word_list, read_words
 
 VOCAB = t.List[str]
 ORTHOGRAPHIC_NEIGHBORHOOD = t.List[str]
-ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH = t.Dict[str, ORTHOGRAPHIC_NEIGHBORHOOD]
+ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH = t.Mapping[str, ORTHOGRAPHIC_NEIGHBORHOOD]
 WORD_PATH = t.List[str]
+NODE = t.TypeVar("NODE", bound=t.Hashable)
 
 
 def check_metagram(word1: str, word2: str) -> bool:
     if len(word1) != len(word2):
         raise ValueError("metagrams must have the same length")
 
+    return hamming_distance(word1, word2) == 1
+
+
+def check_edit_neighbor(word1: str, word2: str) -> bool:
+    """Levenshtein distance 1, a single letter substitution, insertion or deletion"""
+    if len(word1) == len(word2):
+        return hamming_distance(word1, word2) == 1
+
+    shorter, longer = sorted((word1, word2), key=len)
+    if len(longer) - len(shorter) != 1:
+        return False
+    # skip the common prefix, the rest has to match once the extra letter is dropped
+    i = 0
+    while i < len(shorter) and shorter[i] == longer[i]:
+        i += 1
+    return shorter[i:] == longer[i + 1:]
+
+
+def hamming_distance(word1: str, word2: str) -> int:
     # count bool true for 1, when true is not equal pair of letters
-    replace_distance = sum(l1 != l2 for l1, l2 in zip(word1, word2))
-    return replace_distance == 1
+    return sum(l1 != l2 for l1, l2 in zip(word1, word2))
 
 
 def find_orthographic_neighborhood(
@@ -25,13 +46,53 @@ def find_orthographic_neighborhood(
     return list(filter(lambda candidate: check_metagram(word, candidate), vocab))
 
 
-# TODO too slow, dump computed results for later fast loading, flag?
+WILDCARD_PATTERN = t.Tuple[int, str]
+WILDCARD_INDEX = t.Dict[WILDCARD_PATTERN, t.List[int]]
+
+
+def iter_wildcard_patterns(word: str) -> t.Iterable[WILDCARD_PATTERN]:
+    # a pattern is the word with a single letter knocked out, i.e. c_t -> (1, "ct").
+    # the position is kept apart from the letters, so no character is reserved as a wildcard
+    for i in range(len(word)):
+        yield i, word[:i] + word[i + 1:]
+
+
+def build_wildcard_index(vocab: VOCAB) -> WILDCARD_INDEX:
+    # metagrams differ in exactly one position, hence they share exactly one pattern bucket
+    index = {}
+    for word_id, word in enumerate(vocab):
+        for pattern in iter_wildcard_patterns(word):
+            index.setdefault(pattern, []).append(word_id)
+    return index
+
+
 def build_orthographic_neighborhood_graph(
         vocab: VOCAB, word_length: int
+) -> ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH:
+    vocab = [w for w in vocab if len(w) == word_length]
+    index = build_wildcard_index(vocab)
+
+    orthographic_neighborhood_graph = {}
+    for word_id, word in enumerate(vocab):
+        neighbor_ids = []
+        for pattern in iter_wildcard_patterns(word):
+            neighbor_ids.extend(
+                i for i in index[pattern] if vocab[i] != word
+            )
+        # keep neighbors in vocab order, same as the exhaustive scan does
+        neighbor_ids.sort()
+        orthographic_neighborhood_graph[word] = [vocab[i] for i in neighbor_ids]
+
+    return orthographic_neighborhood_graph
+
+
+# exhaustive O(n^2) reference implementation, kept for cross-checking the indexed one
+def build_orthographic_neighborhood_graph_brute_force(
+        vocab: VOCAB, word_length: int
 ) -> ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH:
     vocab = list(
         filter(lambda w: len(w) == word_length, vocab)
-    )  # TODO can be optimized?
+    )
 
     orthographic_neighborhood_graph = {
         w: find_orthographic_neighborhood(w, vocab) for w in vocab
@@ -43,53 +104,114 @@ def build_orthographic_neighborhood_graph(
 def is_word_chain(
         word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
 ) -> bool:
+    # a CompactNeighborhoodGraph carries a connected component index, answering without a search
+    components = getattr(graph, "components", None)
+    if components is not None:
+        return components.are_connected(word1, word2)
+
     q = deque([word1])
-    seen = set()
+    # mark words when they are queued, otherwise a word can be queued once per neighbor
+    seen = {word1}
 
     while q:
         w = q.popleft()
         if w == word2:
             return True
 
-        seen.add(w)
         for neighbor in graph.get(w, []):
             if neighbor not in seen:
+                seen.add(neighbor)
                 q.append(neighbor)
     return False
 
 
 # use depth-first-search to keep track of the path
 def find_word_chain(
-        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, iterative_deepening: bool = False
 ) -> WORD_PATH:
-    return _find_word_chain(word1, word2, graph, set())
+    if iterative_deepening:
+        return _find_word_chain_iterative_deepening(word1, word2, graph)
+    return _find_word_chain(word1, word2, graph)
 
 
 def _find_word_chain(
-        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, seen: set
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
 ) -> WORD_PATH:
-    seen.add(word1)
-    for neighbor in graph.get(word1, []):
-        if neighbor in seen:
-            continue
+    # explicit stack of neighbor iterators, the path holds the word each iterator belongs to
+    seen = {word1}
+    path = [word1]
+    stack = [iter(graph.get(word1, []))]
 
-        if neighbor == word2:
-            return [word1, word2]
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor in seen:
+                continue
 
-        path = _find_word_chain(neighbor, word2, graph, seen)
-        if path:
-            return [word1] + path
+            if neighbor == word2:
+                return path + [word2]
+
+            seen.add(neighbor)
+            path.append(neighbor)
+            stack.append(iter(graph.get(neighbor, [])))
+            break
+        else:
+            stack.pop()
+            path.pop()
 
     return []
 
 
-def read_system_vocab() -> VOCAB:
-    if sys.platform == "darwin":
-        word_list_path = "/usr/share/dict/words"
-    else:
-        raise FileNotFoundError(f"Could not find system word list for {sys.platform}")
+def _find_word_chain_iterative_deepening(
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
+) -> WORD_PATH:
+    # an exhausted search cannot tell "no chain" from "chain longer than the limit",
+    # so rule out unreachable targets up front instead of deepening up to the eccentricity of word1
+    if word1 == word2 or not is_word_chain(word1, word2, graph):
+        return []
+
+    # depth limited searches with a growing limit, the first chain found is a shortest one
+    depth_limit = 1
+    while True:
+        path, was_cut_off = _find_word_chain_depth_limited(word1, word2, graph, depth_limit)
+        if path or not was_cut_off:
+            return path
+        depth_limit += 1
+
+
+def _find_word_chain_depth_limited(
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, depth_limit: int
+) -> t.Tuple[WORD_PATH, bool]:
+    # a word is expanded again only when it is reached by a shorter prefix than before
+    best_depth = {word1: 0}
+    path = [word1]
+    stack = [iter(graph.get(word1, []))]
+    was_cut_off = False
+
+    while stack:
+        for neighbor in stack[-1]:
+            if neighbor == word2:
+                return path + [word2], False
 
-    return open(word_list_path).read().split("\n")
+            depth = len(path)
+            if best_depth.get(neighbor, depth + 1) <= depth:
+                continue
+            if depth == depth_limit:
+                was_cut_off = True
+                continue
+
+            best_depth[neighbor] = depth
+            path.append(neighbor)
+            stack.append(iter(graph.get(neighbor, [])))
+            break
+        else:
+            stack.pop()
+            path.pop()
+
+    return [], was_cut_off
+
+
+def read_system_vocab() -> VOCAB:
+    return read_words(find_system_word_list())
 
 
 def build_dijkstra_graph(graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH) -> DijkstarGraph:
@@ -114,3 +236,117 @@ def find_shortest_word_chain(
         return find_path(graph, word1, word2).nodes
     except NoPathError:
         return []
+
+
+# use bidirectional breadth-first-search, every edge has the same weight
+def find_shortest_word_chain_bfs(
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
+) -> WORD_PATH:
+    if len(word1) != len(word2):
+        raise ValueError("metagrams must have the same length")
+
+    return bidirectional_bfs(word1, word2, lambda w: graph.get(w, ()))
+
+
+# use A* search, every step changes one letter, so the count of differing letters
+# is a consistent lower bound of the remaining chain length
+def find_shortest_word_chain_a_star(
+        word1: str, word2: str, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH
+) -> WORD_PATH:
+    if len(word1) != len(word2):
+        raise ValueError("metagrams must have the same length")
+
+    return a_star_search(word1, word2, lambda w: graph.get(w, ()), lambda w: hamming_distance(w, word2))
+
+
+def a_star_search(
+        source: NODE,
+        target: NODE,
+        get_neighbors: t.Callable[[NODE], t.Iterable[NODE]],
+        heuristic: t.Callable[[NODE], int],
+) -> t.List[NODE]:
+    """Shortest path in an unweighted graph, expanding the node with the lowest distance plus heuristic first.
+
+    The heuristic has to be consistent, then a node is final the first time it is expanded.
+    """
+    distances = {source: 0}
+    parents = {source: None}
+    # ties go to the deeper node, it is closer to the target; the counter keeps nodes out of the comparison
+    tie_breaker = itertools.count()
+    queue = [(heuristic(source), 0, next(tie_breaker), source)]
+
+    while queue:
+        _, negative_distance, _, node = heapq.heappop(queue)
+        distance = -negative_distance
+        if distance > distances[node]:  # a shorter way to the node was expanded already
+            continue
+        if node == target:
+            return _join_parent_paths(node, parents, {node: None})
+
+        for neighbor in get_neighbors(node):
+            if neighbor in distances and distances[neighbor] <= distance + 1:
+                continue
+            distances[neighbor] = distance + 1
+            parents[neighbor] = node
+            heapq.heappush(queue, (distance + 1 + heuristic(neighbor), -distance - 1, next(tie_breaker), neighbor))
+
+    return []
+
+
+def bidirectional_bfs(
+        source: NODE, target: NODE, get_neighbors: t.Callable[[NODE], t.Iterable[NODE]]
+) -> t.List[NODE]:
+    """Shortest path in an undirected unweighted graph, grown level by level from both ends"""
+    if source == target:
+        return [source]
+
+    # parent pointers double as the visited sets of both searches
+    forward_parents = {source: None}
+    backward_parents = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        # expanding the smaller frontier keeps both searches balanced
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, parents, other_parents = forward_frontier, forward_parents, backward_parents
+        else:
+            frontier, parents, other_parents = backward_frontier, backward_parents, forward_parents
+
+        meeting_node = None
+        next_frontier = []
+        for node in frontier:
+            for neighbor in get_neighbors(node):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = node
+                if neighbor in other_parents:
+                    meeting_node = neighbor
+                    break
+                next_frontier.append(neighbor)
+            if meeting_node is not None:
+                return _join_parent_paths(meeting_node, forward_parents, backward_parents)
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    return []
+
+
+def _join_parent_paths(meeting_node: NODE, forward_parents: dict, backward_parents: dict) -> t.List[NODE]:
+    path = []
+    node = meeting_node
+    while node is not None:
+        path.append(node)
+        node = forward_parents[node]
+    path.reverse()
+
+    node = backward_parents[meeting_node]
+    while node is not None:
+        path.append(node)
+        node = backward_parents[node]
+
+    return path
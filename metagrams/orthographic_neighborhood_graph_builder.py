@@ -1,44 +1,257 @@
+import dataclasses
+import os
 import pathlib
 import json
+import time
+import typing as t
+from concurrent.futures import ProcessPoolExecutor
 
-from metagrams.orthographic_neighborhood import VOCAB, ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, \
-    build_orthographic_neighborhood_graph
+from word_squeezer.word_list import write_atomically
+
+from metagrams.orthographic_neighborhood import (
+    VOCAB,
+    ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH,
+    WILDCARD_INDEX,
+    build_wildcard_index,
+)
+from metagrams.compact_graph import (
+    NEIGHBOR_SHARD,
+    CompactNeighborhoodGraph,
+    build_compact_neighborhood_graph,
+    build_neighbor_shard,
+    collect_words,
+    merge_neighbor_shards,
+    patch_compact_neighborhood_graph,
+)
+from metagrams.edit_graph import build_edit_neighborhood_graph, collect_all_words
+from metagrams.graph_cache import (
+    CacheMetadata,
+    compute_vocab_hash,
+    dump_binary_graph,
+    load_binary_graph,
+    read_binary_graph_metadata,
+)
+
+CACHE_FORMATS = ("binary", "json")
+
+# smaller buckets are not worth the inter-process round trip of splitting them up
+MIN_SHARD_WORDS = 5000
+
+# a stale cache is patched, instead of rebuilt, when at most this share of the words changed
+INCREMENTAL_PATCH_RATIO = 0.1
+
+# words and wildcard index by word length, set once per pool worker of OrthographicNeighborhoodGraphBuilder.build_all
+_worker_buckets: t.Dict[int, t.Tuple[t.List[str], WILDCARD_INDEX]] = {}
 
 
 class OrthographicNeighborhoodGraphBuilder:
-    def __init__(self, vocab: VOCAB):
+    def __init__(self, vocab: VOCAB, cache_format: str = "binary"):
+        if cache_format not in CACHE_FORMATS:
+            raise ValueError(f"cache format must be one of {CACHE_FORMATS}")
+
         self._vocab = vocab
+        self._cache_format = cache_format
 
     def build_graph(
             self, word_length: int, no_cache: bool = False
-    ) -> ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH:
-        if not no_cache and self._is_cached(word_length):
+    ) -> CompactNeighborhoodGraph:
+        words = collect_words(self._vocab, word_length)
+        vocab_hash = compute_vocab_hash(words)
+        is_cached = self._is_cached(word_length, vocab_hash)
+
+        if not no_cache and is_cached:
             return self._load_cached_graph(word_length)
 
-        graph = build_orthographic_neighborhood_graph(self._vocab, word_length)
+        graph = None if no_cache else self._patch_stale_graph(words, word_length)
+        if graph is None:
+            graph = build_compact_neighborhood_graph(words, word_length)
 
-        if not self._is_cached(word_length):
-            self._dump_graph(graph, word_length)
+        if not is_cached:
+            self._dump_graph(graph, word_length, vocab_hash)
 
         return graph
 
-    def _load_cached_graph(self, word_length: int) -> ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH:
-        cache_file = self._get_cache_file(word_length)
-        if cache_file.exists():
-            return json.load(cache_file.open())
+    def build_edit_graph(self, no_cache: bool = False) -> CompactNeighborhoodGraph:
+        """Graph of single letter substitutions, insertions and deletions over the words of all lengths.
 
-    def _dump_graph(self, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, word_length: int) -> None:
-        cache_file = self._get_cache_file(word_length)
-        json.dump(graph, cache_file.open(mode="w"), separators=(",", ":"))
+        It is cached like the graphs of a single word length, under the word length None.
+        """
+        words = collect_all_words(self._vocab)
+        vocab_hash = compute_vocab_hash(words)
+        is_cached = self._is_cached(None, vocab_hash)
+
+        if not no_cache and is_cached:
+            return self._load_cached_graph(None)
+
+        graph = build_edit_neighborhood_graph(words)
+        if not is_cached:
+            self._dump_graph(graph, None, vocab_hash)
+
+        return graph
+
+    def build_all(
+            self, word_lengths: t.Optional[t.Iterable[int]] = None, workers: t.Optional[int] = None, no_cache: bool = False
+    ) -> t.List[int]:
+        """Fills the cache for every word length in parallel, returns the word lengths that were built.
+
+        Every length bucket is split into shards of consecutive words, the shards are built by a process pool
+        and merged back in order, so the result is the same as building the length in one go.
+        The wildcard index of a bucket split into several shards is built once, and handed to the workers
+        when they start, so the shards share it instead of each indexing the whole bucket.
+        """
+        workers = workers or os.cpu_count() or 1
+        if word_lengths is None:
+            word_lengths = sorted(set(map(len, self._vocab)))
+        word_lengths = [n for n in word_lengths if no_cache or not self._is_cached(n)]
+
+        words_by_length = {n: collect_words(self._vocab, n) for n in word_lengths}
+        shard_bounds_by_length = {
+            n: self._get_shard_bounds(len(words), workers) for n, words in words_by_length.items()
+        }
+
+        shared_buckets = {
+            n: (words_by_length[n], build_wildcard_index(words_by_length[n]))
+            for n, bounds in shard_bounds_by_length.items()
+            if len(bounds) > 1
+        }
+
+        with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_shard_worker, initargs=(shared_buckets,)
+        ) as pool:
+            shard_futures_by_length = {
+                n: [
+                    pool.submit(_build_shard_in_worker, n, start, stop)
+                    if n in shared_buckets
+                    else pool.submit(build_neighbor_shard, words_by_length[n], start, stop)
+                    for start, stop in bounds
+                ]
+                for n, bounds in shard_bounds_by_length.items()
+            }
+
+            for n, shard_futures in shard_futures_by_length.items():
+                graph = merge_neighbor_shards(words_by_length[n], [future.result() for future in shard_futures])
+                self._dump_graph(graph, n, compute_vocab_hash(words_by_length[n]))
+
+        return word_lengths
+
+    def save_graph(self, graph: ORTHOGRAPHIC_NEIGHBORHOOD_GRAPH, word_length: int) -> None:
+        """Caches a graph that was built or updated elsewhere, it has to match the current vocab"""
+        words = collect_words(self._vocab, word_length)
+        self._dump_graph(CompactNeighborhoodGraph.from_graph(graph), word_length, compute_vocab_hash(words))
+
+    @staticmethod
+    def _get_shard_bounds(n_words: int, workers: int) -> t.List[t.Tuple[int, int]]:
+        n_shards = max(1, min(workers, n_words // MIN_SHARD_WORDS))
+        shard_size = max(1, -(-n_words // n_shards))
+        return [(start, min(start + shard_size, n_words)) for start in range(0, n_words, shard_size)] or [(0, 0)]
 
-    def _is_cached(self, word_length: int) -> bool:
+    def export_json(self, word_length: int, path: pathlib.Path) -> None:
+        graph = self.build_graph(word_length)
+        with path.open(mode="w") as f:
+            json.dump(dict(graph), f, separators=(",", ":"))
+
+    def _patch_stale_graph(self, words: t.List[str], word_length: int) -> t.Optional[CompactNeighborhoodGraph]:
+        """Patches the cached graph of an older vocab, if the vocab changed little enough"""
+        try:
+            stale_graph = self._load_cached_graph(word_length)
+        except ValueError:  # unreadable or written by an older version of the cache format
+            return None
+        if stale_graph is None:
+            return None
+
+        n_added = sum(1 for w in words if w not in stale_graph.word_ids)
+        n_removed = len(stale_graph) - (len(words) - n_added)
+        if n_added + n_removed > INCREMENTAL_PATCH_RATIO * len(words):
+            return None
+
+        return patch_compact_neighborhood_graph(stale_graph, words)
+
+    def _load_cached_graph(self, word_length: t.Optional[int]) -> t.Optional[CompactNeighborhoodGraph]:
         cache_file = self._get_cache_file(word_length)
-        return cache_file.exists()
+        if not cache_file.exists():
+            return None
+
+        if self._cache_format == "binary":
+            return load_binary_graph(cache_file)
+
+        with cache_file.open() as f:
+            return CompactNeighborhoodGraph.from_graph(json.load(f))
+
+    def _dump_graph(self, graph: CompactNeighborhoodGraph, word_length: t.Optional[int], vocab_hash: bytes) -> None:
+        metadata = CacheMetadata(vocab_hash, word_count=len(graph), build_time=time.time())
+
+        # concurrent readers never see a partially written cache file
+        if self._cache_format == "binary":
+            write_atomically(
+                self._get_cache_file(word_length), lambda path: dump_binary_graph(graph, path, metadata)
+            )
+            return
+
+        def dump_json(path: pathlib.Path, obj: dict) -> None:
+            with path.open(mode="w") as f:
+                json.dump(obj, f, separators=(",", ":"))
+
+        def dump_metadata(metadata: CacheMetadata) -> None:
+            write_atomically(
+                self._get_metadata_file(word_length),
+                lambda path: dump_json(path, {**metadata.__dict__, "vocab_hash": metadata.vocab_hash.hex()}),
+            )
+
+        # the graph and its metadata are two files, the metadata matches no vocab while the graph is replaced,
+        # so a reader never pairs a graph with the metadata of another one
+        if self._get_metadata_file(word_length).exists():
+            dump_metadata(dataclasses.replace(metadata, vocab_hash=b""))
+        write_atomically(self._get_cache_file(word_length), lambda path: dump_json(path, dict(graph)))
+        dump_metadata(metadata)
 
-    def _get_cache_file(self, word_length: int) -> pathlib.Path:
-        return self._get_cache_dir() / f"graph-word-size-{word_length}.json"
+    def _read_cache_metadata(self, word_length: t.Optional[int]) -> t.Optional[CacheMetadata]:
+        if self._cache_format == "binary":
+            cache_file = self._get_cache_file(word_length)
+            if not cache_file.exists():
+                return None
+            try:
+                return read_binary_graph_metadata(cache_file)
+            except ValueError:  # written by an older version of the cache format
+                return None
+
+        metadata_file = self._get_metadata_file(word_length)
+        if not metadata_file.exists() or not self._get_cache_file(word_length).exists():
+            return None
+        with metadata_file.open() as f:
+            metadata = json.load(f)
+        return CacheMetadata(**{**metadata, "vocab_hash": bytes.fromhex(metadata["vocab_hash"])})
+
+    def _is_cached(self, word_length: t.Optional[int], vocab_hash: t.Optional[bytes] = None) -> bool:
+        """The cache is only valid for the vocab it was built from, the words of all lengths for the edit graph"""
+        if vocab_hash is None:
+            words = collect_all_words(self._vocab) if word_length is None else collect_words(self._vocab, word_length)
+            vocab_hash = compute_vocab_hash(words)
+
+        metadata = self._read_cache_metadata(word_length)
+        return metadata is not None and metadata.vocab_hash == vocab_hash
+
+    def _get_cache_file(self, word_length: t.Optional[int]) -> pathlib.Path:
+        suffix = "bin" if self._cache_format == "binary" else "json"
+        return self._get_cache_dir() / f"{self._get_graph_name(word_length)}.{suffix}"
+
+    def _get_metadata_file(self, word_length: t.Optional[int]) -> pathlib.Path:
+        return self._get_cache_dir() / f"{self._get_graph_name(word_length)}.json.meta"
+
+    @staticmethod
+    def _get_graph_name(word_length: t.Optional[int]) -> str:
+        return "graph-edit-distance" if word_length is None else f"graph-word-size-{word_length}"
 
     def _get_cache_dir(self) -> pathlib.Path:
         path = pathlib.Path(".graphs")
         path.mkdir(exist_ok=True)
         return path
+
+
+def _init_shard_worker(buckets: t.Dict[int, t.Tuple[t.List[str], WILDCARD_INDEX]]) -> None:
+    global _worker_buckets
+    _worker_buckets = buckets
+
+
+def _build_shard_in_worker(word_length: int, start: int, stop: int) -> NEIGHBOR_SHARD:
+    words, index = _worker_buckets[word_length]
+    return build_neighbor_shard(words, start, stop, index)
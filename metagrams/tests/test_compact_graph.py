@@ -0,0 +1,40 @@
+import random
+
+from ..compact_graph import CompactNeighborhoodGraph, build_compact_neighborhood_graph
+from ..orthographic_neighborhood import (
+    build_orthographic_neighborhood_graph,
+    build_dijkstra_graph,
+    find_shortest_word_chain,
+    is_word_chain,
+    find_word_chain,
+)
+
+from .test_orthographic_neighborhood import dumb_graph
+
+
+def test_compact_graph_from_graph(dumb_graph):
+    graph = CompactNeighborhoodGraph.from_graph(dumb_graph)
+
+    assert graph == dumb_graph
+    assert list(graph) == list(dumb_graph)
+    assert graph.id_of("hook") == 1
+    assert list(graph.neighbor_ids(graph.id_of("hook"))) == [0, 2]
+    assert graph.n_edges == 6
+    assert "nuke" not in graph
+
+
+def test_build_compact_neighborhood_graph():
+    rng = random.Random(42)
+    vocab = list(dict.fromkeys("".join(rng.choices("abcde", k=4)) for _ in range(300)))
+
+    assert build_compact_neighborhood_graph(vocab, 4) == build_orthographic_neighborhood_graph(vocab, 4)
+    assert build_compact_neighborhood_graph(vocab, 5) == {}
+
+
+def test_compact_graph_dict_compatibility(dumb_graph):
+    graph = CompactNeighborhoodGraph.from_graph(dumb_graph)
+
+    assert is_word_chain("hood", "boob", graph)
+    assert not is_word_chain("hood", "nuke", graph)
+    assert find_word_chain("hood", "boob", graph) == ["hood", "hook", "book", "boob"]
+    assert find_shortest_word_chain("hood", "boob", build_dijkstra_graph(graph)) == ["hood", "hook", "book", "boob"]
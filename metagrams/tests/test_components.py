@@ -0,0 +1,45 @@
+from ..compact_graph import CompactNeighborhoodGraph, build_compact_neighborhood_graph
+from ..components import ComponentIndex
+from ..graph_cache import CacheMetadata, compute_vocab_hash, dump_binary_graph, load_binary_graph
+from ..orthographic_neighborhood import is_word_chain
+
+from .test_orthographic_neighborhood import dumb_graph
+
+
+VOCAB = ["hood", "hook", "book", "boob", "bush", "gush", "nuke"]
+
+
+def test_component_index():
+    components = ComponentIndex.from_graph(build_compact_neighborhood_graph(VOCAB, 4))
+
+    assert list(components.labels) == [0, 0, 0, 0, 1, 1, 2]
+    assert components.are_connected("hood", "boob")
+    assert components.are_connected("nuke", "nuke")
+    assert not components.are_connected("hood", "bush")
+    assert not components.are_connected("hood", "cats")
+    assert components.component_size("book") == 4
+    assert components.component_size("cats") == 0
+    assert components.stats() == {
+        "words": 7,
+        "components": 3,
+        "largest_component": 4,
+        "isolated_words": 1,
+        "size_distribution": {1: 1, 2: 1, 4: 1},
+    }
+
+
+def test_is_word_chain_uses_component_index(dumb_graph):
+    graph = CompactNeighborhoodGraph.from_graph(dumb_graph)
+
+    assert is_word_chain("hood", "boob", graph)
+    assert not is_word_chain("hood", "nuke", graph)
+
+
+def test_component_labels_are_cached(tmp_path):
+    cache_file = tmp_path / "graph.bin"
+    graph = build_compact_neighborhood_graph(VOCAB, 4)
+    dump_binary_graph(graph, cache_file, CacheMetadata(compute_vocab_hash(VOCAB), len(graph), build_time=0))
+
+    graph = load_binary_graph(cache_file)
+    assert list(graph.components.labels) == [0, 0, 0, 0, 1, 1, 2]
+    assert graph.find_shortest_word_chain("hood", "gush") == []
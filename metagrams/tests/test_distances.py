@@ -0,0 +1,77 @@
+import itertools
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from .. import distances
+from ..compact_graph import build_compact_neighborhood_graph
+from ..distances import (
+    UNREACHABLE,
+    chain_length_distribution,
+    distances_from,
+    eccentricities,
+    estimate_diameter,
+    neighbors_within,
+)
+from ..orthographic_neighborhood import bidirectional_bfs
+
+
+VOCAB = ["hood", "hook", "book", "boob", "bush", "gush", "nuke"]
+
+
+def test_distances_from():
+    graph = build_compact_neighborhood_graph(VOCAB, 4)
+
+    assert list(distances_from(graph, "hood")) == [0, 1, 2, 3, UNREACHABLE, UNREACHABLE, UNREACHABLE]
+    assert list(distances_from(graph, "hood", max_distance=1)) == [0, 1] + [UNREACHABLE] * 5
+
+
+def test_neighbors_within():
+    graph = build_compact_neighborhood_graph(VOCAB, 4)
+
+    assert neighbors_within(graph, "book", 1) == {"hook": 1, "boob": 1}
+    assert list(neighbors_within(graph, "book", 2).items()) == [("hook", 1), ("boob", 1), ("hood", 2)]
+    assert neighbors_within(graph, "nuke", 3) == {}
+    assert neighbors_within(graph, "cats", 3) == {}
+
+
+def test_eccentricities_and_diameter():
+    graph = build_compact_neighborhood_graph(VOCAB, 4)
+
+    assert eccentricities(graph) == {"hood": 3, "hook": 2, "book": 2, "boob": 3, "bush": 1, "gush": 1, "nuke": 0}
+    assert eccentricities(graph, ["gush", "book"]) == {"gush": 1, "book": 2}
+    assert estimate_diameter(graph) == (3, "hood", "boob")
+    assert estimate_diameter(graph, ["bush"]) == (1, "bush", "gush")
+    assert chain_length_distribution(graph) == {1: 4, 2: 2, 3: 1}
+
+
+def test_bit_parallel_search_without_bitwise_count(monkeypatch):
+    # numpy before 2 has no np.bitwise_count
+    monkeypatch.delattr(distances.np, "bitwise_count")
+    graph = build_compact_neighborhood_graph(VOCAB, 4)
+
+    assert chain_length_distribution(graph) == {1: 4, 2: 2, 3: 1}
+
+
+def test_bit_parallel_search(monkeypatch):
+    # small batches, so sources span several 64 bit words and several sweeps
+    monkeypatch.setattr(distances, "_SOURCES_PER_SWEEP", 96)
+    rng = random.Random(42)
+    vocab = list(dict.fromkeys("".join(rng.choices("abcde", k=4)) for _ in range(150)))
+    graph = build_compact_neighborhood_graph(vocab, 4)
+
+    expected_distribution = {}
+    for source, target in itertools.combinations(range(len(graph)), 2):
+        path = bidirectional_bfs(source, target, graph.neighbor_ids)
+        if path:
+            expected_distribution[len(path) - 1] = expected_distribution.get(len(path) - 1, 0) + 1
+            assert distances_from(graph, graph.words[source])[target] == len(path) - 1
+    assert chain_length_distribution(graph) == expected_distribution
+
+    expected_eccentricities = {w: int(max(distances_from(graph, w))) for w in graph.words}
+    assert eccentricities(graph) == expected_eccentricities
+    diameter, word1, word2 = estimate_diameter(graph)
+    assert diameter == max(expected_distribution) == max(expected_eccentricities.values())
+    assert len(graph.find_shortest_word_chain(word1, word2)) == diameter + 1
@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from ..edit_graph import (
+    build_edit_neighborhood_graph,
+    build_edit_neighborhood_graph_brute_force,
+    find_shortest_edit_chain,
+)
+from ..orthographic_neighborhood import check_edit_neighbor
+from ..orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
+
+
+VOCAB = ["cat", "cart", "card", "hard", "herd", "her", "he", "she", "shed", "aa", "a", "cats", "dog"]
+
+
+def test_check_edit_neighbor():
+    assert check_edit_neighbor("cat", "cot")
+    assert check_edit_neighbor("cat", "cart")
+    assert check_edit_neighbor("cart", "cat")
+    assert check_edit_neighbor("cat", "at")
+    assert check_edit_neighbor("cat", "cats")
+    assert not check_edit_neighbor("cat", "cat")
+    assert not check_edit_neighbor("cat", "act")
+    assert not check_edit_neighbor("cat", "carts")
+    assert not check_edit_neighbor("cat", "tac")
+
+
+def test_build_edit_neighborhood_graph():
+    graph = build_edit_neighborhood_graph(VOCAB)
+
+    assert graph["cat"] == ["cart", "cats"]
+    assert graph["her"] == ["herd", "he"]
+    assert graph["aa"] == ["a"]
+    assert graph["dog"] == []
+    assert graph == build_edit_neighborhood_graph_brute_force(VOCAB)
+
+
+def test_build_edit_neighborhood_graph_random_vocab():
+    rng = random.Random(42)
+    vocab = ["".join(rng.choices("abc", k=rng.randint(1, 5))) for _ in range(300)]
+
+    assert build_edit_neighborhood_graph(vocab) == build_edit_neighborhood_graph_brute_force(vocab)
+
+
+def test_find_shortest_edit_chain():
+    graph = build_edit_neighborhood_graph(VOCAB)
+
+    assert find_shortest_edit_chain(graph, "cat", "shed") == [
+        "cat", "cart", "card", "hard", "herd", "her", "he", "she", "shed"
+    ]
+    assert find_shortest_edit_chain(graph, "cat", "cat") == ["cat"]
+    assert find_shortest_edit_chain(graph, "cat", "dog") == []
+    assert find_shortest_edit_chain(graph, "cat", "cow") == []
+    assert find_shortest_edit_chain(graph, "cow", "cat") == []
+
+
+@pytest.mark.parametrize("cache_format", ["binary", "json"])
+def test_graph_builder_caches_edit_graph(tmp_path, monkeypatch, cache_format):
+    monkeypatch.chdir(tmp_path)
+    builder = OrthographicNeighborhoodGraphBuilder(VOCAB, cache_format=cache_format)
+
+    graph = builder.build_edit_graph()
+    assert builder._is_cached(None)
+    assert not builder._is_cached(3)
+    assert builder.build_edit_graph() == graph
+    chain = find_shortest_edit_chain(builder.build_edit_graph(), "cat", "her")
+    assert chain == ["cat", "cart", "card", "hard", "herd", "her"]
+
+    assert not OrthographicNeighborhoodGraphBuilder(VOCAB + ["cot"], cache_format=cache_format)._is_cached(None)
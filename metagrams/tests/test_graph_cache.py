@@ -0,0 +1,148 @@
+import itertools
+import random
+
+import pytest
+
+from ..compact_graph import build_compact_neighborhood_graph, patch_compact_neighborhood_graph
+
+from ..graph_cache import (
+    CacheMetadata,
+    compute_vocab_hash,
+    dump_binary_graph,
+    load_binary_graph,
+    read_binary_graph_metadata,
+)
+from ..orthographic_neighborhood import build_orthographic_neighborhood_graph
+from .. import orthographic_neighborhood_graph_builder as graph_builder
+from ..orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
+
+
+@pytest.fixture
+def vocab():
+    return ["hood", "hook", "book", "boob", "bóok", "black"]
+
+
+def test_binary_graph_round_trip(vocab, tmp_path):
+    graph = build_orthographic_neighborhood_graph(vocab, 4)
+    cache_file = tmp_path / "graph.bin"
+    metadata = CacheMetadata(compute_vocab_hash(vocab), len(graph), build_time=1700000000.5)
+    dump_binary_graph(graph, cache_file, metadata)
+
+    loaded_graph = load_binary_graph(cache_file)
+
+    assert loaded_graph == graph
+    assert list(loaded_graph) == list(graph)
+    assert loaded_graph["bóok"] == ["book"]
+    assert "nuke" not in loaded_graph
+    assert 5 not in loaded_graph
+    assert loaded_graph.get("nuke", []) == []
+    assert read_binary_graph_metadata(cache_file) == metadata
+
+
+def test_binary_graph_empty(tmp_path):
+    cache_file = tmp_path / "graph.bin"
+    dump_binary_graph({}, cache_file, CacheMetadata(compute_vocab_hash([]), 0, build_time=0))
+
+    assert load_binary_graph(cache_file) == {}
+
+
+@pytest.mark.parametrize("cache_format", ["binary", "json"])
+def test_graph_builder_caches_graph(vocab, tmp_path, monkeypatch, cache_format):
+    monkeypatch.chdir(tmp_path)
+    builder = OrthographicNeighborhoodGraphBuilder(vocab, cache_format=cache_format)
+
+    graph = builder.build_graph(4)
+    assert builder._is_cached(4)
+    assert builder.build_graph(4) == graph
+
+
+def test_graph_builder_exports_json(vocab, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    builder = OrthographicNeighborhoodGraphBuilder(vocab)
+
+    builder.export_json(4, tmp_path / "graph.json")
+    assert (tmp_path / "graph.json").read_text().startswith('{"hood":["hook"]')
+
+
+def test_graph_builder_builds_all_lengths(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(graph_builder, "MIN_SHARD_WORDS", 2)  # force several shards per length
+    vocab = ["hood", "hook", "book", "boob", "bush", "gush", "cat", "cot", "dog", "black"]
+    builder = OrthographicNeighborhoodGraphBuilder(vocab)
+
+    assert builder.build_all(workers=2) == [3, 4, 5]
+    assert builder.build_all(workers=2) == []  # everything is cached already
+    assert sorted(p.name for p in (tmp_path / ".graphs").iterdir()) == [
+        "graph-word-size-3.bin", "graph-word-size-4.bin", "graph-word-size-5.bin"
+    ]
+
+    for word_length in (3, 4, 5):
+        assert builder.build_graph(word_length) == build_orthographic_neighborhood_graph(vocab, word_length)
+
+
+@pytest.mark.parametrize("cache_format", ["binary", "json"])
+def test_graph_builder_invalidates_cache_on_vocab_change(vocab, tmp_path, monkeypatch, cache_format):
+    monkeypatch.chdir(tmp_path)
+    OrthographicNeighborhoodGraphBuilder(vocab, cache_format=cache_format).build_graph(4)
+
+    changed_vocab = vocab + ["boot"]
+    builder = OrthographicNeighborhoodGraphBuilder(changed_vocab, cache_format=cache_format)
+    assert not builder._is_cached(4)
+
+    graph = builder.build_graph(4)
+    assert graph == build_orthographic_neighborhood_graph(changed_vocab, 4)
+    assert builder._is_cached(4)
+    assert builder._read_cache_metadata(4).word_count == 6
+
+
+def test_graph_builder_json_cache_is_invalid_while_replaced(vocab, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    OrthographicNeighborhoodGraphBuilder(vocab, cache_format="json").build_graph(4)
+
+    write_atomically = graph_builder.write_atomically
+
+    def fail_graph_write(path, write):
+        if path.suffix == ".json":
+            raise OSError("disk full")
+        write_atomically(path, write)
+
+    monkeypatch.setattr(graph_builder, "write_atomically", fail_graph_write)
+    builder = OrthographicNeighborhoodGraphBuilder(vocab + ["boot"], cache_format="json")
+    with pytest.raises(OSError):
+        builder.build_graph(4)
+
+    # the old graph is still in place, but its metadata no longer claims any vocab
+    assert not OrthographicNeighborhoodGraphBuilder(vocab, cache_format="json")._is_cached(4)
+
+
+def test_graph_builder_patches_stale_cache(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    vocab = ["".join(letters) for letters in itertools.product("abcd", repeat=4)]
+    OrthographicNeighborhoodGraphBuilder(vocab).build_graph(4)
+
+    changed_vocab = [w for w in vocab if w != "abcd"] + ["abce", "bbce"]
+    patched = []
+    monkeypatch.setattr(
+        graph_builder, "patch_compact_neighborhood_graph",
+        lambda *args: patched.append(args) or patch_compact_neighborhood_graph(*args),
+    )
+
+    graph = OrthographicNeighborhoodGraphBuilder(changed_vocab).build_graph(4)
+    assert patched
+    assert list(graph.items()) == list(build_orthographic_neighborhood_graph(changed_vocab, 4).items())
+
+
+def test_patch_compact_neighborhood_graph():
+    rng = random.Random(3)
+    vocab = list(dict.fromkeys("".join(rng.choices("abcd", k=4)) for _ in range(100)))
+    changed_vocab = vocab[10:] + ["abce", "ebcd", vocab[3]]
+    rng.shuffle(changed_vocab)
+
+    graph = patch_compact_neighborhood_graph(build_compact_neighborhood_graph(vocab, 4), changed_vocab)
+    assert list(graph.items()) == list(build_orthographic_neighborhood_graph(changed_vocab, 4).items())
+
+
+def test_shard_bounds():
+    assert OrthographicNeighborhoodGraphBuilder._get_shard_bounds(0, 4) == [(0, 0)]
+    assert OrthographicNeighborhoodGraphBuilder._get_shard_bounds(10, 4) == [(0, 10)]
+    assert OrthographicNeighborhoodGraphBuilder._get_shard_bounds(12000, 4) == [(0, 6000), (6000, 12000)]
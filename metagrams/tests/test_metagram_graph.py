@@ -0,0 +1,117 @@
+import pytest
+
+from ..compact_graph import CompactNeighborhoodGraph
+from ..metagram_graph import MetagramGraph
+
+
+@pytest.fixture
+def metagram_graph(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # keep the .graphs cache out of the working tree
+    return MetagramGraph(["hood", "hook", "book", "boob", "bush", "cat", "cot", "dot", "dog"])
+
+
+def test_find_word_chain(metagram_graph):
+    assert metagram_graph.find_word_chain("hood", "boob") == ["hood", "hook", "book", "boob"]
+    assert metagram_graph.find_word_chain("cat", "dog") == ["cat", "cot", "dot", "dog"]
+    assert metagram_graph.find_word_chain("hood", "bush") == []
+    assert metagram_graph.find_word_chain("hood", "nuke") == []
+
+
+def test_find_word_chain_length_mismatch(metagram_graph):
+    with pytest.raises(ValueError):
+        metagram_graph.find_word_chain("cat", "hood")
+
+
+def test_find_word_chains(metagram_graph):
+    paths = metagram_graph.find_word_chains([("cat", "dog"), ("hood", "boob"), ("dog", "cot"), ("hood", "bush")])
+
+    assert paths == [
+        ["cat", "cot", "dot", "dog"],
+        ["hood", "hook", "book", "boob"],
+        ["dog", "dot", "cot"],
+        [],
+    ]
+
+
+def test_graphs_stay_resident(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    metagram_graph = MetagramGraph(["ab", "ac", "abc", "abd", "abcd", "abce"], max_resident_lengths=2)
+
+    graph = metagram_graph._get_graph(2)
+    assert metagram_graph._get_graph(2) is graph
+
+    metagram_graph.find_word_chains([("abc", "abd"), ("abcd", "abce")])
+    assert list(metagram_graph._graphs) == [3, 4]  # least recently used length 2 was evicted
+
+
+def test_is_word_chain(metagram_graph):
+    assert metagram_graph.is_word_chain("hood", "boob")
+    assert not metagram_graph.is_word_chain("hood", "bush")
+    assert not metagram_graph.is_word_chain("hood", "cat")
+    assert metagram_graph.component_stats(3)["components"] == 1
+
+
+def test_add_and_remove_words(metagram_graph):
+    assert metagram_graph.find_word_chain("hood", "bush") == []
+
+    assert metagram_graph.add_word("bosk")
+    assert metagram_graph.add_word("busk")
+    assert metagram_graph.add_word("husky")
+    assert not metagram_graph.add_word("book")
+    assert metagram_graph.find_word_chain("hood", "bush") == ["hood", "hook", "book", "bosk", "busk", "bush"]
+
+    assert metagram_graph.remove_word("bosk")
+    assert not metagram_graph.remove_word("bosk")
+    assert not metagram_graph.is_word_chain("hood", "bush")
+
+
+def test_updated_graphs_are_saved(metagram_graph):
+    metagram_graph.find_word_chain("hood", "boob")
+    metagram_graph.add_word("boot")
+    metagram_graph.save()
+
+    reloaded = MetagramGraph(["hood", "hook", "book", "boob", "bush", "cat", "cot", "dot", "dog", "boot"])
+    assert reloaded._graph_builder._is_cached(4)
+    assert reloaded.find_word_chain("hood", "boot") == ["hood", "hook", "book", "boot"]
+
+
+def test_distance_queries(metagram_graph):
+    pytest.importorskip("numpy")
+
+    assert metagram_graph.neighbors_within("cat", 2) == {"cot": 1, "dot": 2}
+    assert metagram_graph.chain_length_distribution(3) == {1: 3, 2: 2, 3: 1}
+    assert metagram_graph.estimate_diameter(3) == (3, "cat", "dog")
+
+    metagram_graph.add_word("cog")
+    assert metagram_graph.neighbors_within("cat", 2) == {"cot": 1, "dot": 2, "cog": 2}
+    assert metagram_graph.chain_length_distribution(3) == {1: 5, 2: 4, 3: 1}
+
+
+def test_distance_queries_flatten_updated_graphs_once(metagram_graph, monkeypatch):
+    pytest.importorskip("numpy")
+    metagram_graph.add_word("cog")
+
+    flattened = []
+    from_graph = CompactNeighborhoodGraph.from_graph.__func__
+
+    def counting_from_graph(cls, graph):
+        flattened.append(graph)
+        return from_graph(cls, graph)
+
+    monkeypatch.setattr(CompactNeighborhoodGraph, "from_graph", classmethod(counting_from_graph))
+    metagram_graph.neighbors_within("cat", 2)
+    metagram_graph.neighbors_within("dog", 2)
+    assert len(flattened) == 1
+
+    metagram_graph.remove_word("cog")
+    assert metagram_graph.neighbors_within("cat", 3) == {"cot": 1, "dot": 2, "dog": 3}
+    assert len(flattened) == 2
+
+
+def test_find_edit_chain(metagram_graph):
+    assert metagram_graph.find_edit_chain("cat", "dog") == ["cat", "cot", "dot", "dog"]
+    assert metagram_graph.find_edit_chain("cat", "hood") == []
+
+    metagram_graph.add_word("hot")
+    metagram_graph.add_word("hoot")
+    assert metagram_graph.find_edit_chain("cat", "hood") == ["cat", "cot", "hot", "hoot", "hood"]
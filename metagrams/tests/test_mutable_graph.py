@@ -0,0 +1,54 @@
+import random
+
+from ..compact_graph import build_compact_neighborhood_graph
+from ..mutable_graph import MutableNeighborhoodGraph
+from ..orthographic_neighborhood import build_orthographic_neighborhood_graph
+
+
+def _component_partition(graph) -> set:
+    members = {}
+    for word in graph:
+        members.setdefault(graph.components.component_of(word), set()).add(word)
+    return {frozenset(words) for words in members.values()}
+
+
+def test_add_and_remove_words():
+    graph = MutableNeighborhoodGraph(build_compact_neighborhood_graph(["hood", "hook", "book", "boob"], 4))
+
+    assert graph.add_word("boot")
+    assert not graph.add_word("boot")
+    assert graph["book"] == ["hook", "boob", "boot"]
+    assert graph["boot"] == ["book", "boob"]
+
+    assert graph.remove_word("book")
+    assert not graph.remove_word("book")
+    assert graph == {"hood": ["hook"], "hook": ["hood"], "boob": ["boot"], "boot": ["boob"]}
+    assert not graph.components.are_connected("hood", "boot")
+    assert graph.find_shortest_word_chain("boob", "boot") == ["boob", "boot"]
+
+    assert graph.add_word("book")
+    assert graph.find_shortest_word_chain("hood", "boot") == ["hood", "hook", "book", "boot"]
+    assert graph["boot"] == ["boob", "book"]  # re-added words get a new id
+    assert graph.components.stats()["components"] == 1
+
+
+def test_updates_match_rebuild():
+    rng = random.Random(11)
+    vocab = list(dict.fromkeys("".join(rng.choices("abc", k=4)) for _ in range(40)))
+    graph = MutableNeighborhoodGraph(build_compact_neighborhood_graph(vocab, 4))
+
+    for _ in range(300):
+        word = "".join(rng.choices("abc", k=4))
+        if word in vocab:
+            vocab.remove(word)
+            assert graph.remove_word(word)
+        else:
+            vocab.append(word)
+            assert graph.add_word(word)
+
+        expected = build_compact_neighborhood_graph(vocab, 4)
+        assert list(graph.items()) == list(build_orthographic_neighborhood_graph(vocab, 4).items())
+        assert _component_partition(graph) == _component_partition(expected)
+        assert sorted(graph.components.component_sizes().values()) == sorted(
+            expected.components.component_sizes().values()
+        )
@@ -8,6 +8,8 @@ from ..orthographic_neighborhood import (
 )
 from ..orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
 
+import sys
+
 import pytest
 
 
@@ -37,6 +39,29 @@ def test_find_word_chain(dumb_graph):
     assert find_word_chain("hood", "boob", dumb_graph) == ["hood", "hook", "book", "boob"]
 
 
+def test_find_word_chain_iterative_deepening(dumb_graph):
+    # hood - hook - book - boob
+    #    \               /
+    #     hoop  ---  boop
+    graph = dict(dumb_graph, hood=["hook", "hoop"], hoop=["hood", "boop"], boop=["hoop", "boob"])
+    graph["boob"] = ["book", "boop"]
+
+    assert find_word_chain("hood", "boob", graph) == ["hood", "hook", "book", "boob"]
+    assert find_word_chain("hood", "boop", graph) == ["hood", "hook", "book", "boob", "boop"]
+    assert find_word_chain("hood", "boop", graph, iterative_deepening=True) == ["hood", "hoop", "boop"]
+    assert find_word_chain("hood", "nuke", graph, iterative_deepening=True) == []
+    assert find_word_chain("hood", "hood", graph, iterative_deepening=True) == []
+
+
+def test_find_word_chain_does_not_recurse():
+    words = [f"w{i}" for i in range(sys.getrecursionlimit() + 100)]
+    line_graph = {w: [v for v in (words[i - 1] if i else None, words[i + 1] if i + 1 < len(words) else None) if v]
+                  for i, w in enumerate(words)}
+
+    assert find_word_chain(words[0], words[-1], line_graph) == words
+    assert find_word_chain(words[0], words[-1], line_graph, iterative_deepening=True) == words
+
+
 def test_find_word_chain_on_system_vocab():
     graph = OrthographicNeighborhoodGraphBuilder(read_system_vocab()).build_graph(3)
 
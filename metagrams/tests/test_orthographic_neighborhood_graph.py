@@ -1,5 +1,9 @@
+import random
+
 from ..orthographic_neighborhood import (
     build_orthographic_neighborhood_graph,
+    build_orthographic_neighborhood_graph_brute_force,
+    build_wildcard_index,
     read_system_vocab,
     build_dijkstra_graph,
 )
@@ -24,6 +28,26 @@ def test_orthographic_neighborhood_graph():
     assert graph == {}
 
 
+def test_build_wildcard_index():
+    index = build_wildcard_index(["cat", "cot", "bat"])
+
+    assert index[(1, "ct")] == [0, 1]
+    assert index[(0, "at")] == [0, 2]
+    assert index[(2, "ca")] == [0]
+
+
+def test_orthographic_neighborhood_graph_matches_brute_force():
+    rng = random.Random(42)
+    vocab = ["".join(rng.choices("abcde", k=rng.randint(2, 4))) for _ in range(500)]
+    vocab += ["Abc", "abc", "ab_", "a_c"]  # mixed case, duplicates and underscores
+
+    for word_length in range(2, 5):
+        graph = build_orthographic_neighborhood_graph(vocab, word_length)
+        expected = build_orthographic_neighborhood_graph_brute_force(vocab, word_length)
+
+        assert list(graph.items()) == list(expected.items())
+
+
 # smoke test
 def test_build_dijkstra_graph():
     graph = OrthographicNeighborhoodGraphBuilder(read_system_vocab()).build_graph(3)
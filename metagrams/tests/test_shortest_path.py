@@ -1,7 +1,13 @@
+import random
+
+from ..compact_graph import build_compact_neighborhood_graph
 from ..orthographic_neighborhood import (
     read_system_vocab,
     build_dijkstra_graph,
     find_shortest_word_chain,
+    find_shortest_word_chain_a_star,
+    find_shortest_word_chain_bfs,
+    check_metagram,
 )
 from ..orthographic_neighborhood_graph_builder import OrthographicNeighborhoodGraphBuilder
 
@@ -36,3 +42,51 @@ def test_find_shortest_word_chain__finds_the_path_both_ways():
     d_graph = build_dijkstra_graph(graph)
 
     assert find_shortest_word_chain("dog", "cat", d_graph) == find_shortest_word_chain("cat", "dog", d_graph)[::-1]
+
+
+def test_find_shortest_word_chain_bfs(dumb_graph):
+    assert find_shortest_word_chain_bfs("hood", "boob", dumb_graph) == ["hood", "hook", "book", "boob"]
+    assert find_shortest_word_chain_bfs("boob", "hood", dumb_graph) == ["boob", "book", "hook", "hood"]
+    assert find_shortest_word_chain_bfs("hood", "hood", dumb_graph) == ["hood"]
+    assert find_shortest_word_chain_bfs("hood", "bush", dumb_graph) == []
+
+
+def test_find_shortest_word_chain_bfs__matches_dijkstra_path_lengths():
+    rng = random.Random(7)
+    vocab = list(dict.fromkeys("".join(rng.choices("abcd", k=4)) for _ in range(120)))
+    graph = build_compact_neighborhood_graph(vocab, 4)
+    d_graph = build_dijkstra_graph(graph)
+
+    for _ in range(200):
+        word1, word2 = rng.choice(vocab), rng.choice(vocab)
+        expected = find_shortest_word_chain(word1, word2, d_graph)
+
+        for path in (find_shortest_word_chain_bfs(word1, word2, graph), graph.find_shortest_word_chain(word1, word2)):
+            assert len(path) == len(expected)
+            assert path[:1] == expected[:1] and path[-1:] == expected[-1:]
+            assert all(check_metagram(w1, w2) for w1, w2 in zip(path, path[1:]))
+
+
+def test_find_shortest_word_chain_a_star(dumb_graph):
+    assert find_shortest_word_chain_a_star("hood", "boob", dumb_graph) == ["hood", "hook", "book", "boob"]
+    assert find_shortest_word_chain_a_star("hood", "hood", dumb_graph) == ["hood"]
+    assert find_shortest_word_chain_a_star("hood", "bush", dumb_graph) == []
+
+
+def test_find_shortest_word_chain_a_star__matches_dijkstra_path_lengths():
+    rng = random.Random(11)
+    vocab = list(dict.fromkeys("".join(rng.choices("abcde", k=5)) for _ in range(600)))
+    graph = build_compact_neighborhood_graph(vocab, 5)
+    d_graph = build_dijkstra_graph(graph)
+
+    for _ in range(200):
+        word1, word2 = rng.choice(vocab), rng.choice(vocab)
+        expected = find_shortest_word_chain(word1, word2, d_graph)
+
+        for path in (
+                find_shortest_word_chain_a_star(word1, word2, graph),
+                graph.find_shortest_word_chain(word1, word2, search="a_star"),
+        ):
+            assert len(path) == len(expected)
+            assert path[:1] == expected[:1] and path[-1:] == expected[-1:]
+            assert all(check_metagram(w1, w2) for w1, w2 in zip(path, path[1:]))
@@ -7,7 +7,7 @@ setup(
     description="Word finding games",
     author="pablohonney",
     packages=find_packages(exclude=["tests"]),
-    extras_require={"tests": ["pytest"]},
+    extras_require={"tests": ["pytest"], "anagram-index": ["numpy"]},
     entry_points={
         "console_scripts": [
             "word-squeezer = word_squeezer.word_squeezer:main",
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from word_squeezer.anagram_index import AnagramIndex, AnagramIndexSqueezer
+from word_squeezer.trie import Trie
+from word_squeezer.word_squeezer import WordSqueezer
+
+
+def test_anagram_index_squeezer():
+    index = AnagramIndex(
+        "black white yellow groin mignon minor morin brown grey red".split()
+    )
+    ws = AnagramIndexSqueezer(index)
+
+    assert ws.squeeze("morning") == "groin mignon minor morin".split()
+    assert ws.squeeze("x") == []
+
+
+def test_anagram_index_squeeze_many_returns_independent_lists():
+    ws = AnagramIndexSqueezer(AnagramIndex("listen silent tin".split()))
+
+    listen, silent = ws.squeeze_many(["listen", "silent"])
+    listen.append("x")
+    assert silent == "listen silent tin".split()
+
+
+def test_anagram_index_groups_anagrams():
+    index = AnagramIndex("listen silent enlist tinsel inlets tin".split())
+
+    assert len(index) == 2
+    assert index.squeeze("silent") == "enlist inlets listen silent tin tinsel".split()
+
+
+def test_anagram_index_matches_trie():
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcdef", k=rng.randint(1, 6))) for _ in range(2000)]
+    queries = ["".join(rng.choices("abcdefg", k=rng.randint(0, 9))) for _ in range(200)]
+
+    assert AnagramIndexSqueezer(AnagramIndex(words)).squeeze_many(
+        queries
+    ) == WordSqueezer(Trie(words)).squeeze_many(queries)
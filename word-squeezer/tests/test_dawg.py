@@ -0,0 +1,121 @@
+import random
+
+import pytest
+
+from word_squeezer.dawg import Dawg, load_or_build_dawg
+from word_squeezer.trie import Trie
+from word_squeezer.wordament_solver import WordamentSolver
+from word_squeezer.word_squeezer import WordSqueezer
+
+
+def test_get_node_in_dawg():
+    dawg = Dawg("hell hello world".split())
+
+    assert dawg.get_node("hel").is_word is False
+    assert dawg.get_node("hel").is_prefix is True
+
+    assert dawg.get_node("hell").is_word is True
+    assert dawg.get_node("hell").is_prefix is True
+
+    assert dawg.get_node("hello").is_word is True
+    assert dawg.get_node("hello").is_prefix is False
+
+    assert "help" not in dawg
+
+
+def test_dawg_shares_suffixes():
+    dawg = Dawg("walking talking walked talked".split())
+
+    # root -{w, t}-> a -> l -> k -> {i -> n, e} -> one final node, a trie needs 17 nodes
+    assert dawg.n_nodes == 9
+    assert list(dawg) == "talked talking walked walking".split()
+
+
+def test_dawg_matches_trie():
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcd", k=rng.randint(1, 6))) for _ in range(500)]
+    trie, dawg = Trie(words), Dawg(words)
+
+    assert list(dawg) == sorted(set(words))
+    for _ in range(500):
+        probe = "".join(rng.choices("abcde", k=rng.randint(0, 7)))
+        assert (probe in dawg) == (probe in trie)
+        assert dawg.is_prefix(probe) == trie.is_prefix(probe)
+
+
+def test_dawg_requires_sorted_words():
+    assert list(Dawg.from_sorted_words("a a ab b".split())) == "a ab b".split()
+
+    with pytest.raises(ValueError):
+        Dawg.from_sorted_words("b a".split())
+
+
+def test_save_and_load_dawg(tmp_path):
+    words = "black white yellow groin mignon minor morin brown grey red".split()
+    word_list_file = tmp_path / "words"
+    word_list_file.write_text("\n".join(words) + "\n")
+    dawg_file = tmp_path / "words.dawg"
+
+    dawg = load_or_build_dawg(dawg_file, word_list_file)
+    word_list_file.unlink()
+    loaded_dawg = load_or_build_dawg(dawg_file)
+
+    assert list(loaded_dawg) == list(dawg) == sorted(words)
+    assert WordSqueezer(loaded_dawg).squeeze("morning") == WordSqueezer(
+        Trie(words)
+    ).squeeze("morning")
+
+    grid = [list("lrtl"), list("faan"), list("gcst"), list("leel")]
+    assert WordamentSolver(loaded_dawg).squeeze(grid) == WordamentSolver(
+        Trie(words)
+    ).squeeze(grid)
+
+
+def test_load_or_build_dawg_rebuilds_stale_files(tmp_path):
+    word_list_file = tmp_path / "words"
+    word_list_file.write_text("cat\ndog\n")
+    dawg_file = tmp_path / "words.dawg"
+
+    assert list(load_or_build_dawg(dawg_file, word_list_file)) == ["cat", "dog"]
+    assert Dawg.load(dawg_file).word_list_stamp == (
+        word_list_file.stat().st_size,
+        word_list_file.stat().st_mtime_ns,
+    )
+
+    word_list_file.write_text("cat\ncow\ndog\n")
+    assert list(load_or_build_dawg(dawg_file, word_list_file)) == ["cat", "cow", "dog"]
+    assert list(load_or_build_dawg(dawg_file)) == ["cat", "cow", "dog"]
+
+    # without a word list the DAWG file is trusted
+    word_list_file.write_text("emu\n")
+    assert list(load_or_build_dawg(dawg_file)) == ["cat", "cow", "dog"]
+
+
+def test_load_or_build_dawg_keeps_fresh_files(tmp_path, monkeypatch):
+    word_list_file = tmp_path / "words"
+    word_list_file.write_text("cat\ndog\n")
+    dawg_file = tmp_path / "words.dawg"
+    load_or_build_dawg(dawg_file, word_list_file)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a fresh DAWG file was rebuilt")
+
+    monkeypatch.setattr(Dawg, "from_word_list", fail)
+    assert list(load_or_build_dawg(dawg_file, word_list_file)) == ["cat", "dog"]
+
+
+def test_load_or_build_dawg_rebuilds_older_formats(tmp_path):
+    word_list_file = tmp_path / "words"
+    word_list_file.write_text("cat\n")
+    dawg_file = tmp_path / "words.dawg"
+    dawg_file.write_bytes(b"WORDDAWG" + bytes(12))
+
+    assert list(load_or_build_dawg(dawg_file, word_list_file)) == ["cat"]
+
+
+def test_load_rejects_other_files(tmp_path):
+    path = tmp_path / "words.dawg"
+    path.write_bytes(b"not a dawg at all, really")
+
+    with pytest.raises(ValueError):
+        Dawg.load(path)
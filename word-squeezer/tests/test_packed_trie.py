@@ -0,0 +1,58 @@
+import random
+
+from word_squeezer.packed_trie import PackedTrie
+from word_squeezer.trie import Trie
+from word_squeezer.wordament_solver import WordamentSolver
+from word_squeezer.word_squeezer import WordSqueezer
+
+
+def test_get_node_in_packed_trie():
+    trie = PackedTrie("hell hello world".split())
+
+    assert trie.get_node("hel").is_word is False
+    assert trie.get_node("hel").is_prefix is True
+
+    assert trie.get_node("hell").is_word is True
+    assert trie.get_node("hell").is_prefix is True
+
+    assert trie.get_node("hello").is_word is True
+    assert trie.get_node("hello").is_prefix is False
+
+    assert trie.get_node("help").is_word is False
+    assert trie.get_node("help").is_prefix is False
+
+
+def test_add_to_packed_trie():
+    trie = PackedTrie("hell world".split())
+    assert "hello" not in trie
+
+    trie.add("hello")
+    trie.add("hell")
+
+    assert "hello" in trie
+    assert list(trie) == "hell hello world".split()
+
+
+def test_packed_trie_matches_trie():
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcd", k=rng.randint(1, 6))) for _ in range(500)]
+    trie, packed_trie = Trie(words), PackedTrie(words)
+
+    assert list(packed_trie) == sorted(set(words))
+    for _ in range(500):
+        probe = "".join(rng.choices("abcde", k=rng.randint(0, 7)))
+        assert (probe in packed_trie) == (probe in trie)
+        assert packed_trie.is_prefix(probe) == trie.is_prefix(probe)
+
+
+def test_solvers_accept_packed_trie():
+    words = "black white yellow groin mignon minor morin brown grey red".split()
+    assert WordSqueezer(PackedTrie(words)).squeeze("morning") == WordSqueezer(
+        Trie(words)
+    ).squeeze("morning")
+
+    grid = [list("lrtl"), list("faan"), list("gcst"), list("leel")]
+    words = "cast last salt seel lest fact".split()
+    assert WordamentSolver(PackedTrie(words)).squeeze(grid) == WordamentSolver(
+        Trie(words)
+    ).squeeze(grid)
@@ -0,0 +1,45 @@
+from word_squeezer.packed_trie import PackedTrie
+from word_squeezer.solver_context import SolverContext
+from word_squeezer.trie import Trie
+from word_squeezer.wordament_solver import solve_wordament
+from word_squeezer.word_squeezer import solve_word_squeezer
+
+WORDS = "black white yellow groin mignon minor morin morning brown grey red".split()
+
+
+def test_solve_word_squeezer_with_context(capsys):
+    solve_word_squeezer("morning", WORDS, target_word_length=6)
+    expected = capsys.readouterr().out
+
+    context = SolverContext.from_wordlist(WORDS)
+    solve_word_squeezer("morning", target_word_length=6, context=context)
+    assert capsys.readouterr().out == expected == "mignon\n"
+
+
+def test_solve_wordament_with_context(capsys):
+    grid = [list("lrtl"), list("faan"), list("gcst"), list("leel")]
+    words = "cast last salt seel lest fact at".split()
+
+    solve_wordament(grid, words, target_word_length=3)
+    expected = capsys.readouterr().out
+
+    solve_wordament(grid, target_word_length=3, context=SolverContext(Trie(words)))
+    assert capsys.readouterr().out == expected
+    assert "at\n" not in expected.splitlines(keepends=True)
+
+
+def test_derived_tries_are_cached():
+    context = SolverContext(PackedTrie(WORDS), max_derived_tries=1)
+    assert context.derived_trie() is context.trie
+
+    trie = context.derived_trie(min_word_length=6, excluded_words=["morning"])
+    assert isinstance(trie, PackedTrie)
+    assert list(trie) == ["mignon", "yellow"]
+    assert context.derived_trie(6, {"morning"}) is trie
+
+    context.derived_trie(min_word_length=5)
+    assert context.derived_trie(6, {"morning"}) is not trie
+
+
+def test_iterate_trie():
+    assert list(Trie(["b", "ab", "a", "abc"])) == ["a", "ab", "abc", "b"]
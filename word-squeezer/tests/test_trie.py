@@ -20,3 +20,14 @@ def test_membership_in_trie():
     assert "hel" not in trie
     assert "hell" in trie
     assert "hello" in trie
+
+
+def test_walk_trie_from_root():
+    trie = Trie("hell hello world".split())
+
+    node = trie.root
+    for letter in "hell":
+        node = trie.get_child(node, letter)
+    assert node.is_word is True
+
+    assert trie.get_child(node, "x").is_prefix is False
@@ -0,0 +1,77 @@
+import os
+import stat
+
+import pytest
+
+from word_squeezer.word_list import (
+    SortedWordTable,
+    iter_words,
+    load_word_table,
+    read_words,
+    write_atomically,
+)
+
+
+@pytest.fixture
+def word_list_file(tmp_path):
+    path = tmp_path / "words"
+    path.write_text("Apple\napple\n\n  pear \nfig\néclair\napple\n")
+    return path
+
+
+def test_read_words(word_list_file):
+    assert read_words(word_list_file) == ["Apple", "apple", "pear", "fig", "éclair", "apple"]
+
+
+def test_iter_words_normalization(word_list_file):
+    words = iter_words(word_list_file, lowercase=True, dedupe=True, min_length=4, max_length=5)
+
+    assert next(words) == "apple"  # lazy
+    assert list(words) == ["pear"]
+
+
+def test_word_table(word_list_file, tmp_path):
+    table = load_word_table(word_list_file, table_path=tmp_path / "table", lowercase=True)
+
+    assert list(table) == ["apple", "fig", "pear", "éclair"]
+    assert len(table) == 4
+    assert table[1] == "fig"
+    assert "pear" in table
+    assert "Apple" not in table
+    assert "plum" not in table
+
+
+def test_word_table_is_cached(word_list_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    assert list(load_word_table(word_list_file)) == list(load_word_table(word_list_file))
+    assert len(list((tmp_path / "cache" / "word-squeezer").iterdir())) == 1
+
+
+def test_word_table_replaces_superseded_tables(word_list_file, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    load_word_table(word_list_file)
+    load_word_table(word_list_file, lowercase=True)
+
+    word_list_file.write_text("kiwi\n")
+    assert list(load_word_table(word_list_file)) == ["kiwi"]
+    # the lowercased table of the old word list is for other options, it is left alone
+    assert len(list((tmp_path / "cache" / "word-squeezer").iterdir())) == 2
+
+
+def test_empty_word_table(tmp_path):
+    SortedWordTable.dump([], tmp_path / "table")
+
+    assert list(SortedWordTable.load(tmp_path / "table")) == []
+
+
+def test_write_atomically_follows_umask(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        write_atomically(tmp_path / "file", lambda path: path.write_bytes(b"data"))
+    finally:
+        os.umask(umask)
+
+    assert (tmp_path / "file").read_bytes() == b"data"
+    assert stat.S_IMODE((tmp_path / "file").stat().st_mode) == 0o644
+    assert os.listdir(tmp_path) == ["file"]  # the temp file was renamed
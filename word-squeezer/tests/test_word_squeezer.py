@@ -8,3 +8,11 @@ def test_word_squeezer():
 
     squeezed_words = ws.squeeze("morning")
     assert squeezed_words == "groin mignon minor morin".split()
+
+
+def test_squeeze_raw_has_no_duplicates():
+    trie = Trie("bee beer bob book boom keep keeper peek poke".split())
+    ws = WordSqueezer(trie)
+
+    squeezed_words = list(ws._squeeze_raw("bookkeeper"))
+    assert sorted(squeezed_words) == "bee beer book keep keeper peek poke".split()
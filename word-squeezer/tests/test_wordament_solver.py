@@ -0,0 +1,88 @@
+import random
+import time
+
+import pytest
+
+from word_squeezer.dawg import Dawg
+from word_squeezer.packed_trie import PackedTrie
+from word_squeezer.trie import Trie
+from word_squeezer import wordament_solver
+from word_squeezer.wordament_solver import WordamentSolver
+
+
+@pytest.mark.parametrize("trie_class", [Trie, PackedTrie, Dawg])
+def test_fast_mode_matches_grid_traversal(trie_class):
+    rng = random.Random(0)
+    words = ["".join(rng.choices("abcde", k=rng.randint(2, 7))) for _ in range(3000)]
+    grid = [rng.choices("abcde", k=5) for _ in range(4)]
+    trie = trie_class(words)
+
+    squeezed_words = WordamentSolver(trie, fast=True).squeeze(grid)
+    assert squeezed_words == WordamentSolver(trie, fast=False).squeeze(grid)
+    assert squeezed_words
+
+
+def test_fast_mode_with_multi_letter_slots():
+    grid = [["qu", "i"], ["t", "e"]]
+    trie = Trie("quite quit tie it".split())
+
+    assert sorted(WordamentSolver(trie).squeeze(grid)) == "it quit quite tie".split()
+    assert WordamentSolver(trie).squeeze(grid) == WordamentSolver(
+        trie, fast=False
+    ).squeeze(grid)
+
+
+def test_solve_returns_unique_words_with_best_path():
+    grid = [list("lrtl"), list("faan"), list("gcst"), list("leel")]
+    ws = WordamentSolver(Trie("cast last salt seel lest fact".split()))
+
+    solved_words = ws.solve(grid)
+    assert [w.word for w in solved_words] == "cast last salt lest seel".split()
+    assert len(ws.squeeze(grid)) > len(solved_words)
+
+    cast = solved_words[0]
+    assert cast.score == 3 + 2 + 2 + 2
+    assert "".join(grid[i][j] for i, j in cast.path) == "cast"
+
+    assert ws.solve(grid, top_k=2) == solved_words[:2]
+
+
+def test_iter_words_streams_unique_words():
+    grid = [list("lrtl"), list("faan"), list("gcst"), list("leel")]
+    ws = WordamentSolver(Trie("cast last salt seel lest fact".split()))
+
+    streamed_words = list(ws.iter_words(grid))
+    assert sorted(w.word for w in streamed_words) == sorted(set(ws.squeeze(grid)))
+
+    assert list(ws.iter_words(grid, time_budget=0)) == []
+
+
+def test_time_budget_bounds_prefix_only_search():
+    # every path of the board is a prefix, but there is no word to find
+    grid = [list("aaaaa") for _ in range(5)]
+    ws = WordamentSolver(Trie(["a" * 20 + "z"]))
+
+    start = time.monotonic()
+    assert ws.solve(grid, time_budget=0.1) == []
+    assert time.monotonic() - start < 2
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_parallel_search_matches_sequential(fast):
+    rng = random.Random(1)
+    words = ["".join(rng.choices("abcde", k=rng.randint(2, 6))) for _ in range(2000)]
+    grids = [[rng.choices("abcde", k=4) for _ in range(4)] for _ in range(3)]
+    ws = WordamentSolver(PackedTrie(words), fast=fast)
+
+    assert ws.squeeze(grids[0], workers=2) == ws.squeeze(grids[0])
+    assert ws.solve(grids[0], workers=2) == ws.solve(grids[0])
+    assert ws.solve_many(grids, workers=2, top_k=5) == [
+        ws.solve(grid, top_k=5) for grid in grids
+    ]
+
+
+def test_pool_workers_keep_the_solver_mode(monkeypatch):
+    monkeypatch.setattr(wordament_solver, "_worker_solver", None)
+    wordament_solver._init_worker(Trie(["cat"]), False)
+
+    assert wordament_solver._worker_solver.fast is False
@@ -0,0 +1,114 @@
+import typing as t
+
+try:
+    import numpy as np
+except ImportError:  # optional, pip install word-squeezer[anagram-index]
+    np = None
+
+# letter counts are stored as uint8
+_MAX_LETTER_COUNT = 255
+
+
+class AnagramIndex:
+    """Words grouped by their sorted-letter signature, with a letter count matrix of the signatures.
+
+    The words that can be made from some letters are the signatures whose letter counts are all
+    at most the letter counts of the query, found by a vectorized comparison over all signatures
+    instead of a permutation search. Letters outside the alphabet of the words are ignored.
+    """
+
+    def __init__(self, words: t.Iterable[str]):
+        if np is None:
+            raise ImportError("AnagramIndex requires numpy")
+
+        words_by_signature: t.Dict[str, t.List[str]] = {}
+        for word in set(words):
+            if word:
+                words_by_signature.setdefault("".join(sorted(word)), []).append(word)
+
+        self.signatures = sorted(words_by_signature)
+        self.words = [sorted(words_by_signature[s]) for s in self.signatures]
+        self.alphabet = sorted(set("".join(self.signatures)))
+        self._letter_ids = {letter: i for i, letter in enumerate(self.alphabet)}
+
+        # one row per letter, so a query compares contiguous rows
+        self.counts = np.zeros(
+            (len(self.alphabet), len(self.signatures)), dtype=np.uint8
+        )
+        if self.signatures:
+            lengths = np.fromiter(map(len, self.signatures), dtype=np.intp)
+            codes = np.frombuffer(
+                "".join(self.signatures).encode("utf-32-le"), dtype=np.uint32
+            )
+            alphabet_codes = np.fromiter(map(ord, self.alphabet), dtype=np.uint32)
+            np.add.at(
+                self.counts,
+                (
+                    np.searchsorted(alphabet_codes, codes),
+                    np.repeat(np.arange(len(self.signatures)), lengths),
+                ),
+                1,
+            )
+
+        # the set of letters of each signature as a bitmask, for alphabets that fit into 64 bits
+        self._letter_sets = None
+        if len(self.alphabet) <= 64:
+            self._letter_sets = np.zeros(len(self.signatures), dtype=np.uint64)
+            for letter_id, letter_counts in enumerate(self.counts):
+                self._letter_sets[letter_counts > 0] |= np.uint64(1 << letter_id)
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def squeeze(self, letters: str) -> t.List[str]:
+        """Words made of a sub-multiset of the letters, unique and sorted"""
+        query = np.zeros(len(self.alphabet), dtype=np.intp)
+        for letter in letters:
+            letter_id = self._letter_ids.get(letter)
+            if letter_id is not None:
+                query[letter_id] += 1
+
+        query_letter_ids = np.flatnonzero(query)
+        if self._letter_sets is not None:
+            # only signatures without letters missing from the query can fit,
+            # a single pass over all of them leaves few candidates for the count comparisons
+            query_set = np.uint64(
+                sum(1 << int(letter_id) for letter_id in query_letter_ids)
+            )
+            candidates = np.flatnonzero((self._letter_sets & ~query_set) == 0)
+        else:
+            candidates = np.arange(len(self.signatures))
+            query_letter_ids = range(len(self.alphabet))
+
+        for letter_id in query_letter_ids:
+            if query[letter_id] < _MAX_LETTER_COUNT:
+                candidates = candidates[
+                    self.counts[letter_id, candidates] <= query[letter_id]
+                ]
+
+        return sorted(word for i in candidates for word in self.words[i])
+
+    def squeeze_many(self, words: t.Iterable[str]) -> t.List[t.List[str]]:
+        """Batch version of squeeze, anagrams among the words are only looked up once"""
+        squeezed_by_signature: t.Dict[str, t.List[str]] = {}
+        results = []
+        for word in words:
+            signature = "".join(sorted(word))
+            if signature not in squeezed_by_signature:
+                squeezed_by_signature[signature] = self.squeeze(signature)
+            # a copy per word, so the results of anagrams can be changed independently
+            results.append(list(squeezed_by_signature[signature]))
+        return results
+
+
+class AnagramIndexSqueezer:
+    """Drop-in for WordSqueezer's squeeze and squeeze_many, backed by an anagram index instead of a trie"""
+
+    def __init__(self, index: AnagramIndex):
+        self.index = index
+
+    def squeeze(self, word: str) -> t.List[str]:
+        return self.index.squeeze(word)
+
+    def squeeze_many(self, words: t.Iterable[str]) -> t.List[t.List[str]]:
+        return self.index.squeeze_many(words)
@@ -0,0 +1,420 @@
+"""Ad-hoc performance measurements for the word games, e.g.
+
+python -m word_squeezer.benchmarks trie -f /usr/share/dict/words
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import random
+import tempfile
+import time
+import timeit
+import tracemalloc
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+from .dawg import Dawg
+from .packed_trie import PackedTrie
+from .solver_context import SolverContext
+from .trie import TRIE, Trie
+from .word_list import find_system_word_list, read_words
+from .wordament_solver import WordamentSolver, WordGrid
+from .word_squeezer import WordSqueezer, solve_word_squeezer
+
+TRIE_CLASSES: t.Dict[str, t.Type[TRIE]] = {
+    "trie": Trie,
+    "packed-trie": PackedTrie,
+    "dawg": Dawg,
+}
+
+
+def benchmark_trie(
+    words: t.List[str], lookups: int = 100_000, seed: int = 0
+) -> t.Dict[str, dict]:
+    rng = random.Random(seed)
+    probes = rng.choices(words, k=lookups // 2)
+    # misses share a real prefix, so the lookups do not all stop at the first letter
+    probes += [w[: len(w) // 2] + "#" for w in rng.choices(words, k=lookups // 2)]
+    source_word = max(rng.sample(words, k=min(len(words), 1000)), key=len)
+
+    results = {}
+    for name, trie_class in TRIE_CLASSES.items():
+        start = time.perf_counter()
+        trie = trie_class(words)
+        trie.get_node("")  # the packed trie builds its arrays lazily
+        build_time = time.perf_counter() - start
+        del trie
+
+        # measured apart from the build time, tracing slows down allocations a lot
+        gc.collect()
+        tracemalloc.start()
+        trie = trie_class(words)
+        trie.get_node("")
+        retained_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        lookup_time = timeit.timeit(
+            lambda: [probe in trie for probe in probes], number=1
+        )
+        squeeze_time = timeit.timeit(
+            lambda: WordSqueezer(trie).squeeze(source_word), number=1
+        )
+
+        results[name] = {
+            "build_s": round(build_time, 3),
+            "retained_mb": round(retained_bytes / 2**20, 1),
+            "lookup_us": round(lookup_time / len(probes) * 1e6, 2),
+            f"squeeze_{source_word}_s": round(squeeze_time, 3),
+        }
+        del trie
+
+    return results
+
+
+def benchmark_dawg_load(words: t.List[str]) -> t.Dict[str, float]:
+    start = time.perf_counter()
+    dawg = Dawg(words)
+    build_time = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as directory:
+        dawg_file = Path(directory) / "words.dawg"
+        dawg.save(dawg_file)
+
+        start = time.perf_counter()
+        Dawg.load(dawg_file)
+        load_time = time.perf_counter() - start
+
+        file_size = dawg_file.stat().st_size
+
+    return {
+        "build_s": round(build_time, 3),
+        "load_s": round(load_time, 4),
+        "file_mb": round(file_size / 2**20, 1),
+        "nodes": dawg.n_nodes,
+        "edges": dawg.n_edges,
+    }
+
+
+def benchmark_squeeze(
+    words: t.List[str], sources: int = 5, seed: int = 0
+) -> t.Dict[str, dict]:
+    """Cursor traversal against re-walking the trie from the root, on 12-15 letter source words"""
+    rng = random.Random(seed)
+    long_words = [w for w in words if 12 <= len(w) <= 15]
+    source_words = rng.sample(long_words, k=min(sources, len(long_words)))
+
+    results = {}
+    for name, trie_class in TRIE_CLASSES.items():
+        squeezer = WordSqueezer(trie_class(words))
+
+        start = time.perf_counter()
+        expected = [
+            sorted(set(_permute_and_check_from_root(squeezer.trie, w)))
+            for w in source_words
+        ]
+        root_walk_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        squeezed = [squeezer.squeeze(w) for w in source_words]
+        cursor_time = time.perf_counter() - start
+
+        assert squeezed == expected
+        results[name] = {
+            "root_walk_s": round(root_walk_time, 3),
+            "cursor_s": round(cursor_time, 3),
+            "speedup": round(root_walk_time / cursor_time, 1),
+        }
+
+    return results
+
+
+def _permute_and_check_from_root(
+    trie: TRIE, letters: str, prefix: str = ""
+) -> t.Iterable[str]:
+    # WordSqueezer._permute_and_check before the cursor traversal, as a baseline
+    for i, letter in enumerate(letters):
+        new_word = prefix + letter
+
+        node = trie.get_node(new_word)
+        if node.is_word:
+            yield new_word
+
+        if node.is_prefix:
+            yield from _permute_and_check_from_root(
+                trie, letters[:i] + letters[i + 1 :], prefix=new_word
+            )
+
+
+REPEATED_LETTER_WORDS = [
+    "bookkeeper",
+    "mississippi",
+    "assessments",
+    "tattletale",
+    "senselessness",
+]
+
+
+def benchmark_repeated_letters(words: t.List[str]) -> t.Dict[str, dict]:
+    """Multiset search against trying every letter position, on source words with repeated letters"""
+    trie = Trie(words)
+
+    results = {}
+    for source_word in REPEATED_LETTER_WORDS:
+        per_position_trie = _CountingTrie(trie)
+        start = time.perf_counter()
+        expected = sorted(
+            set(_permute_and_check_per_position(per_position_trie, source_word))
+        )
+        per_position_time = time.perf_counter() - start
+
+        multiset_trie = _CountingTrie(trie)
+        start = time.perf_counter()
+        squeezed = WordSqueezer(multiset_trie).squeeze(source_word)
+        multiset_time = time.perf_counter() - start
+
+        assert squeezed == expected
+        results[source_word] = {
+            "per_position_s": round(per_position_time, 4),
+            "multiset_s": round(multiset_time, 4),
+            "per_position_visits": per_position_trie.visits,
+            "multiset_visits": multiset_trie.visits,
+        }
+
+    return results
+
+
+class _CountingTrie:
+    """Counts the nodes a search visits"""
+
+    def __init__(self, trie: TRIE):
+        self._trie = trie
+        self.root = trie.root
+        self.visits = 0
+
+    def get_child(self, node, letter: str):
+        self.visits += 1
+        return self._trie.get_child(node, letter)
+
+
+def _permute_and_check_per_position(
+    trie: TRIE, letters: str, node=None, prefix=None, used=None
+) -> t.Iterable[str]:
+    # WordSqueezer._permute_and_check before the multiset search, as a baseline
+    if node is None:
+        node, prefix, used = trie.root, [], [False] * len(letters)
+
+    for i, letter in enumerate(letters):
+        if used[i]:
+            continue
+
+        child = trie.get_child(node, letter)
+        if child.is_word:
+            yield "".join(prefix) + letter
+
+        if child.is_prefix:
+            used[i] = True
+            prefix.append(letter)
+            yield from _permute_and_check_per_position(
+                trie, letters, child, prefix, used
+            )
+            prefix.pop()
+            used[i] = False
+
+
+def benchmark_anagram_index(
+    words: t.List[str], queries: int = 1000, seed: int = 0
+) -> t.Dict[str, dict]:
+    """Bulk squeeze_many requests of 7-10 letters, trie permutation search against the anagram index"""
+    from .anagram_index import AnagramIndex, AnagramIndexSqueezer
+
+    rng = random.Random(seed)
+    query_words = rng.choices([w for w in words if 7 <= len(w) <= 10], k=queries)
+
+    backends = {
+        "trie": lambda: WordSqueezer(Trie(words)),
+        "anagram-index": lambda: AnagramIndexSqueezer(AnagramIndex(words)),
+    }
+    results, squeezed_by_backend = {}, {}
+    for name, build in backends.items():
+        start = time.perf_counter()
+        squeezer = build()
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        squeezed_by_backend[name] = squeezer.squeeze_many(query_words)
+        query_time = time.perf_counter() - start
+
+        results[name] = {
+            "build_s": round(build_time, 3),
+            "queries_per_s": round(len(query_words) / query_time, 1),
+        }
+
+    assert squeezed_by_backend["trie"] == squeezed_by_backend["anagram-index"]
+    return results
+
+
+def benchmark_solver_context(
+    words: t.List[str], requests: int = 20, seed: int = 0
+) -> t.Dict[str, float]:
+    """solve_word_squeezer calls that build a trie each, against calls sharing a SolverContext"""
+    rng = random.Random(seed)
+    source_words = rng.sample([w for w in words if len(w) >= 8], k=requests)
+
+    with contextlib.redirect_stdout(io.StringIO()) as rebuilt_output:
+        start = time.perf_counter()
+        for source_word in source_words:
+            solve_word_squeezer(source_word, words, target_word_length=5)
+        rebuild_time = time.perf_counter() - start
+
+    with contextlib.redirect_stdout(io.StringIO()) as shared_output:
+        start = time.perf_counter()
+        context = SolverContext.from_wordlist(words)
+        for source_word in source_words:
+            solve_word_squeezer(source_word, target_word_length=5, context=context)
+        shared_time = time.perf_counter() - start
+
+    assert rebuilt_output.getvalue() == shared_output.getvalue()
+    return {
+        "rebuild_per_request_s": round(rebuild_time / requests, 4),
+        "shared_context_per_request_s": round(shared_time / requests, 4),
+    }
+
+
+def benchmark_wordament(
+    words: t.List[str], board_sizes: t.Sequence[int] = (4, 5, 10), seed: int = 0
+) -> t.Dict[str, dict]:
+    """Fast cell-index mode against the grid traversal, on random boards with the word list's letter frequencies"""
+    rng = random.Random(seed)
+    letter_counts = Counter("".join(words))
+    letters, weights = list(letter_counts), list(letter_counts.values())
+    trie = Trie(words)
+
+    results = {}
+    for size in board_sizes:
+        grid = [rng.choices(letters, weights=weights, k=size) for _ in range(size)]
+
+        timings = {}
+        squeezed_by_mode = {}
+        for mode, fast in (("grid", False), ("fast", True)):
+            start = time.perf_counter()
+            squeezed_by_mode[mode] = WordamentSolver(trie, fast=fast).squeeze(grid)
+            timings[f"{mode}_s"] = round(time.perf_counter() - start, 4)
+
+        assert squeezed_by_mode["grid"] == squeezed_by_mode["fast"]
+        start = time.perf_counter()
+        solved_words = WordamentSolver(trie).solve(grid)
+        timings["solve_s"] = round(time.perf_counter() - start, 4)
+
+        start = time.perf_counter()
+        top_words = WordamentSolver(trie).solve(grid, top_k=10, time_budget=0.01)
+        timings["solve_top_10_in_10_ms_s"] = round(time.perf_counter() - start, 4)
+
+        results[f"{size}x{size}"] = {
+            **timings,
+            "speedup": round(timings["grid_s"] / timings["fast_s"], 1),
+            "words": len(squeezed_by_mode["fast"]),
+            "unique_words": len(solved_words),
+            "top_words": [(w.word, w.score) for w in top_words[:3]],
+        }
+
+    return results
+
+
+def benchmark_wordament_parallel(
+    words: t.List[str],
+    max_workers: t.Optional[int] = None,
+    board_size: int = 12,
+    boards: int = 32,
+    seed: int = 0,
+) -> t.Dict[int, dict]:
+    """Scaling of the start cell fan-out on one large board and of solve_many on a batch of 5x5 boards"""
+    rng = random.Random(seed)
+    letter_counts = Counter("".join(words))
+    letters, weights = list(letter_counts), list(letter_counts.values())
+
+    def random_grid(size: int) -> WordGrid:
+        return [rng.choices(letters, weights=weights, k=size) for _ in range(size)]
+
+    large_grid = random_grid(board_size)
+    grid_batch = [random_grid(5) for _ in range(boards)]
+    solver = WordamentSolver(Dawg(words))
+
+    expected_large = solver.solve(large_grid)
+    expected_batch = [solver.solve(grid) for grid in grid_batch]
+
+    results = {}
+    for workers in range(1, (max_workers or os.cpu_count() or 1) + 1):
+        start = time.perf_counter()
+        assert solver.solve(large_grid, workers=workers) == expected_large
+        large_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        assert solver.solve_many(grid_batch, workers=workers) == expected_batch
+        batch_time = time.perf_counter() - start
+
+        results[workers] = {
+            f"solve_{board_size}x{board_size}_s": round(large_time, 3),
+            f"solve_many_{boards}_boards_s": round(batch_time, 3),
+        }
+
+    return results
+
+
+def get_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "benchmark",
+        choices=[
+            "trie",
+            "dawg-load",
+            "squeeze",
+            "repeated-letters",
+            "anagram-index",
+            "solver-context",
+            "wordament",
+            "wordament-parallel",
+        ],
+    )
+    parser.add_argument("-f", "--word-list-file", type=Path, help="Wordlist file path")
+    parser.add_argument(
+        "-j", "--max-workers", type=int, help="Largest pool size of scaling benchmarks"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = get_args()
+    words = read_words(args.word_list_file or find_system_word_list())
+
+    if args.benchmark == "trie":
+        for name, result in benchmark_trie(words).items():
+            print(name, result)
+    elif args.benchmark == "dawg-load":
+        print(benchmark_dawg_load(words))
+    elif args.benchmark == "squeeze":
+        for name, result in benchmark_squeeze(words).items():
+            print(name, result)
+    elif args.benchmark == "repeated-letters":
+        for source_word, result in benchmark_repeated_letters(words).items():
+            print(source_word, result)
+    elif args.benchmark == "anagram-index":
+        for name, result in benchmark_anagram_index(words).items():
+            print(name, result)
+    elif args.benchmark == "solver-context":
+        print(benchmark_solver_context(words))
+    elif args.benchmark == "wordament":
+        for board, result in benchmark_wordament(words).items():
+            print(board, result)
+    elif args.benchmark == "wordament-parallel":
+        for workers, result in benchmark_wordament_parallel(
+            words, args.max_workers
+        ).items():
+            print(workers, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import os
+import struct
+import typing as t
+from array import array
+from pathlib import Path
+
+from .word_list import iter_words, write_atomically
+
+_DAWG_MAGIC = b"WORDDAWG"
+_DAWG_VERSION = 2
+# magic, version, node count, edge count,
+# word list size and mtime in ns, zero if the DAWG was not built from a file
+_DAWG_HEADER = struct.Struct("=8sIIIQQ")
+
+# size and modification time of the word list a DAWG was built from
+WORD_LIST_STAMP = t.Tuple[int, int]
+
+
+class _BuildNode:
+    __slots__ = ("is_word", "children")
+
+    def __init__(self):
+        self.is_word = False
+        self.children: t.Dict[str, "_BuildNode"] = {}
+
+    def signature(self) -> tuple:
+        # children are minimized before their parent, so equal subtrees are the very same objects
+        return self.is_word, tuple(
+            (letter, id(child)) for letter, child in self.children.items()
+        )
+
+
+class Dawg:
+    """Minimal acyclic word automaton, a prefix tree whose equal suffix subtrees are shared.
+
+    Built incrementally from sorted words (Daciuk et al., 2000), so only the path of the
+    previous word is ever unminimized. The automaton is stored in flat arrays:
+    the outgoing edges of node i are edge_offsets[i] .. edge_offsets[i + 1] - 1,
+    sorted by their letter in edge_labels, leading to the nodes in edge_targets.
+
+    A Dawg is immutable, it can be saved to and loaded from a binary file. A Dawg built
+    from a word list file keeps the file's size and mtime, to detect stale DAWG files.
+    """
+
+    class Node:
+        """Lightweight view of a node id, the sentinel node has the id -1"""
+
+        __slots__ = ("_dawg", "index")
+
+        def __init__(self, dawg: "Dawg", index: int):
+            self._dawg = dawg
+            self.index = index
+
+        @property
+        def is_word(self) -> bool:
+            return self.index >= 0 and self._dawg._is_word(self.index)
+
+        @property
+        def is_prefix(self) -> bool:
+            return self.index >= 0 and self._dawg._has_edges(self.index)
+
+    def __init__(self, words: t.Iterable[str]):
+        self._set_arrays(*self._build(sorted(set(words))))
+        self.word_list_stamp: t.Optional[WORD_LIST_STAMP] = None
+
+    @classmethod
+    def from_sorted_words(cls, words: t.Iterable[str]) -> "Dawg":
+        """Builds without sorting the words first, they must be sorted and may repeat"""
+        dawg = cls.__new__(cls)
+        dawg._set_arrays(*cls._build(words))
+        dawg.word_list_stamp = None
+        return dawg
+
+    @classmethod
+    def from_word_list(cls, word_list_path: Path, **normalization) -> "Dawg":
+        # stamped before reading, a file changed meanwhile looks stale on the next load
+        word_list_stamp = get_word_list_stamp(word_list_path)
+        dawg = cls(iter_words(word_list_path, **normalization))
+        dawg.word_list_stamp = word_list_stamp
+        return dawg
+
+    def _set_arrays(
+        self, edge_offsets: array, edge_labels: str, edge_targets: array, word_bits
+    ) -> None:
+        self._edge_offsets = edge_offsets
+        self._edge_labels = edge_labels
+        self._edge_targets = edge_targets
+        self._word_bits = word_bits
+        self._sentinel_node = self.Node(self, -1)
+
+    def __contains__(self, word: str) -> bool:
+        return self.get_node(word).is_word
+
+    def is_prefix(self, word: str) -> bool:
+        return self.get_node(word).is_prefix
+
+    @property
+    def root(self) -> Node:
+        return self.Node(self, 0)
+
+    def get_child(self, node: Node, letter: str) -> Node:
+        """Single step of get_node, for searches that carry the current node along"""
+        if node.index < 0:
+            return node
+        edge = self._edge_labels.find(
+            letter, self._edge_offsets[node.index], self._edge_offsets[node.index + 1]
+        )
+        return (
+            self._sentinel_node
+            if edge < 0
+            else self.Node(self, self._edge_targets[edge])
+        )
+
+    def get_node(self, word: str) -> Node:
+        edge_offsets, edge_labels, edge_targets = (
+            self._edge_offsets,
+            self._edge_labels,
+            self._edge_targets,
+        )
+        node = 0
+        for letter in word:
+            edge = edge_labels.find(letter, edge_offsets[node], edge_offsets[node + 1])
+            if edge < 0:
+                return self._sentinel_node
+            node = edge_targets[edge]
+        return self.Node(self, node)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self._edge_offsets) - 1
+
+    @property
+    def n_edges(self) -> int:
+        return len(self._edge_targets)
+
+    def __iter__(self) -> t.Iterator[str]:
+        """Words in sorted order"""
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self._is_word(node):
+                yield prefix
+            edges = range(self._edge_offsets[node], self._edge_offsets[node + 1])
+            stack.extend(
+                (self._edge_targets[edge], prefix + self._edge_labels[edge])
+                for edge in reversed(edges)
+            )
+
+    def save(self, path: Path) -> None:
+        def write(temp_path: Path) -> None:
+            with open(temp_path, "wb") as f:
+                f.write(
+                    _DAWG_HEADER.pack(
+                        _DAWG_MAGIC,
+                        _DAWG_VERSION,
+                        self.n_nodes,
+                        self.n_edges,
+                        *(self.word_list_stamp or (0, 0)),
+                    )
+                )
+                f.write(self._edge_offsets.tobytes())
+                f.write(self._edge_targets.tobytes())
+                f.write(self._edge_labels.encode("utf-32-le"))
+                f.write(self._word_bits)
+
+        # a concurrent reader never loads a partial DAWG
+        write_atomically(path, write)
+
+    @classmethod
+    def load(cls, path: Path) -> "Dawg":
+        with open(path, "rb") as f:
+            header = f.read(_DAWG_HEADER.size)
+            if len(header) < _DAWG_HEADER.size:
+                raise ValueError(f"{path} is not a DAWG file")
+            magic, version, n_nodes, n_edges, *word_list_stamp = _DAWG_HEADER.unpack(
+                header
+            )
+            if magic != _DAWG_MAGIC or version != _DAWG_VERSION:
+                raise ValueError(f"{path} is not a version {_DAWG_VERSION} DAWG file")
+
+            edge_offsets = array("I")
+            edge_offsets.frombytes(f.read(4 * (n_nodes + 1)))
+            edge_targets = array("I")
+            edge_targets.frombytes(f.read(4 * n_edges))
+            edge_labels = f.read(4 * n_edges).decode("utf-32-le")
+            word_bits = bytearray(f.read((n_nodes + 7) // 8))
+
+        dawg = cls.__new__(cls)
+        dawg._set_arrays(edge_offsets, edge_labels, edge_targets, word_bits)
+        dawg.word_list_stamp = tuple(word_list_stamp) if any(word_list_stamp) else None
+        return dawg
+
+    def _is_word(self, node: int) -> bool:
+        return bool(self._word_bits[node >> 3] >> (node & 7) & 1)
+
+    def _has_edges(self, node: int) -> bool:
+        return self._edge_offsets[node] != self._edge_offsets[node + 1]
+
+    @staticmethod
+    def _build(words: t.Iterable[str]) -> t.Tuple[array, str, array, bytearray]:
+        root = _BuildNode()
+        register: t.Dict[tuple, _BuildNode] = {}
+        # edges on the path of the previous word, their targets are not minimized yet
+        unchecked: t.List[t.Tuple[_BuildNode, str, _BuildNode]] = []
+
+        def minimize(down_to: int) -> None:
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                signature = child.signature()
+                if signature in register:
+                    parent.children[letter] = register[signature]
+                else:
+                    register[signature] = child
+
+        previous_word = ""
+        for word in words:
+            if word < previous_word:
+                raise ValueError(
+                    f"words are not sorted: {word!r} after {previous_word!r}"
+                )
+
+            common_prefix_length = 0
+            for letter, previous_letter in zip(word, previous_word):
+                if letter != previous_letter:
+                    break
+                common_prefix_length += 1
+
+            minimize(common_prefix_length)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common_prefix_length:]:
+                child = _BuildNode()
+                node.children[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.is_word = True
+            previous_word = word
+        minimize(0)
+
+        # number the nodes breadth-first and flatten their edges
+        node_ids = {id(root): 0}
+        nodes = [root]
+        edge_offsets = array("I", [0])
+        edge_labels = []
+        edge_targets = array("I")
+        for node in nodes:
+            for letter, child in node.children.items():
+                if id(child) not in node_ids:
+                    node_ids[id(child)] = len(nodes)
+                    nodes.append(child)
+                edge_labels.append(letter)
+                edge_targets.append(node_ids[id(child)])
+            edge_offsets.append(len(edge_targets))
+
+        word_bits = bytearray((len(nodes) + 7) // 8)
+        for node_id, node in enumerate(nodes):
+            if node.is_word:
+                word_bits[node_id >> 3] |= 1 << (node_id & 7)
+
+        return edge_offsets, "".join(edge_labels), edge_targets, word_bits
+
+
+def load_or_build_dawg(
+    dawg_path: Path, word_list_path: t.Optional[Path] = None
+) -> Dawg:
+    """Loads a prebuilt DAWG file, building and saving it from the word list if there is none.
+
+    Given the word list, a DAWG file built from an older version of it, or written in
+    an older format, is rebuilt as well.
+    """
+    if dawg_path.exists():
+        if word_list_path is None:
+            return Dawg.load(dawg_path)
+        try:
+            dawg = Dawg.load(dawg_path)
+        except ValueError:  # written by an older version of the format
+            dawg = None
+        if dawg is not None and dawg.word_list_stamp == get_word_list_stamp(
+            word_list_path
+        ):
+            return dawg
+    elif word_list_path is None:
+        raise FileNotFoundError(
+            f"{dawg_path} does not exist and there is no word list to build it"
+        )
+
+    dawg = Dawg.from_word_list(word_list_path)
+    dawg.save(dawg_path)
+    return dawg
+
+
+def get_word_list_stamp(word_list_path: Path) -> WORD_LIST_STAMP:
+    stat = os.stat(word_list_path)
+    return stat.st_size, stat.st_mtime_ns
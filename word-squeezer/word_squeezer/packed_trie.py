@@ -0,0 +1,143 @@
+import typing as t
+from array import array
+from bisect import bisect_left
+
+
+class PackedTrie:
+    """Array-backed prefix tree, with the lookup surface of Trie at a fraction of its memory.
+
+    Nodes are numbered in breadth-first order, so the children of a node are consecutive:
+    node i has the children first_child[i] .. first_child[i + 1] - 1, sorted by their letter,
+    and labels[c] is the letter on the edge into node c. Word ends are kept in a bitset.
+
+    The arrays are immutable, added words are buffered and the arrays are rebuilt on the next lookup.
+    """
+
+    class Node:
+        """Lightweight view of a node id, the sentinel node has the id -1"""
+
+        __slots__ = ("_trie", "index")
+
+        def __init__(self, trie: "PackedTrie", index: int):
+            self._trie = trie
+            self.index = index
+
+        @property
+        def is_word(self) -> bool:
+            return self.index >= 0 and self._trie._is_word(self.index)
+
+        @property
+        def is_prefix(self) -> bool:
+            return self.index >= 0 and self._trie._has_children(self.index)
+
+    def __init__(self, words: t.Iterable[str]):
+        self._pending_words: t.List[str] = list(words)
+        self._first_child = array("I", [1, 1])
+        self._labels = "\0"  # the root has no incoming edge
+        self._word_bits = bytearray(1)
+        self._sentinel_node = self.Node(self, -1)
+
+    def add(self, word: str) -> None:
+        self._pending_words.append(word)
+
+    def __contains__(self, word: str) -> bool:
+        return self.get_node(word).is_word
+
+    def is_prefix(self, word: str) -> bool:
+        return self.get_node(word).is_prefix
+
+    @property
+    def root(self) -> Node:
+        if self._pending_words:
+            self._pack()
+        return self.Node(self, 0)
+
+    def get_child(self, node: Node, letter: str) -> Node:
+        """Single step of get_node, for searches that carry the current node along"""
+        if node.index < 0:
+            return node
+        index = self._labels.find(
+            letter, self._first_child[node.index], self._first_child[node.index + 1]
+        )
+        return self._sentinel_node if index < 0 else self.Node(self, index)
+
+    def get_node(self, word: str) -> Node:
+        if self._pending_words:
+            self._pack()
+
+        first_child, labels = self._first_child, self._labels
+        node = 0
+        for letter in word:
+            node = labels.find(letter, first_child[node], first_child[node + 1])
+            if node < 0:
+                return self._sentinel_node
+        return self.Node(self, node)
+
+    def __len__(self) -> int:
+        """Number of nodes, including the root"""
+        if self._pending_words:
+            self._pack()
+        return len(self._labels)
+
+    def __iter__(self) -> t.Iterator[str]:
+        """Words in sorted order"""
+        if self._pending_words:
+            self._pack()
+        return self._iter_words()
+
+    def _iter_words(self) -> t.Iterator[str]:
+        stack = [(0, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if self._is_word(node):
+                yield prefix
+            children = range(self._first_child[node], self._first_child[node + 1])
+            stack.extend(
+                (child, prefix + self._labels[child]) for child in reversed(children)
+            )
+
+    def _is_word(self, node: int) -> bool:
+        return bool(self._word_bits[node >> 3] >> (node & 7) & 1)
+
+    def _has_children(self, node: int) -> bool:
+        return self._first_child[node] != self._first_child[node + 1]
+
+    def _pack(self) -> None:
+        words = sorted(set(self._iter_words()).union(self._pending_words))
+        self._pending_words = []
+
+        # every node covers the range of sorted words sharing its prefix,
+        # the nodes are laid out level by level
+        first_child = array("I")
+        labels = ["\0"]
+        word_ends = []
+        level = [(0, len(words))]
+        depth = 0
+        while level:
+            next_level = []
+            for start, stop in level:
+                first_child.append(len(labels))
+                # the word ending at this node, if any, sorts first in its range
+                if start < stop and len(words[start]) == depth:
+                    word_ends.append(len(first_child) - 1)
+                    start += 1
+
+                while start < stop:
+                    # the words of the child sort before its prefix with the next letter
+                    prefix = words[start][: depth + 1]
+                    successor = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                    child_stop = bisect_left(words, successor, start + 1, stop)
+                    labels.append(prefix[-1])
+                    next_level.append((start, child_stop))
+                    start = child_stop
+            level = next_level
+            depth += 1
+        first_child.append(len(labels))
+
+        word_bits = bytearray((len(labels) + 7) // 8)
+        for node in word_ends:
+            word_bits[node >> 3] |= 1 << (node & 7)
+
+        self._first_child = first_child
+        self._labels = "".join(labels)
+        self._word_bits = word_bits
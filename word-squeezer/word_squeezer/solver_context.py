@@ -0,0 +1,59 @@
+import typing as t
+from collections import OrderedDict
+
+from .trie import TRIE, Trie
+
+DERIVED_TRIE_KEY = t.Tuple[t.Optional[int], t.FrozenSet[str]]
+
+
+class SolverContext:
+    """Dictionary structure of a word list, built once and shared by many solver calls.
+
+    The minimum word length and the excluded words (e.g. the source word) are applied to the
+    results at query time, so the trie never has to be rebuilt per request. Tries with the rules
+    applied to the structure itself are derived on demand and kept in a small LRU cache.
+    """
+
+    def __init__(self, trie: TRIE, max_derived_tries: int = 4):
+        self.trie = trie
+        self._max_derived_tries = max_derived_tries
+        self._derived_tries: t.OrderedDict[DERIVED_TRIE_KEY, TRIE] = OrderedDict()
+
+    @classmethod
+    def from_wordlist(
+        cls, wordlist: t.Iterable[str], trie_class: t.Type[TRIE] = Trie, **kwargs
+    ) -> "SolverContext":
+        return cls(trie_class(list(wordlist)), **kwargs)
+
+    @staticmethod
+    def apply_rules(
+        words: t.Iterable[str],
+        min_word_length: t.Optional[int] = None,
+        excluded_words: t.Collection[str] = (),
+    ) -> t.List[str]:
+        return [
+            word
+            for word in words
+            if len(word) >= (min_word_length or 0) and word not in excluded_words
+        ]
+
+    def derived_trie(
+        self,
+        min_word_length: t.Optional[int] = None,
+        excluded_words: t.Collection[str] = (),
+    ) -> TRIE:
+        """Trie of the words that pass the rules, for callers that walk the trie themselves"""
+        key = (min_word_length or None, frozenset(excluded_words))
+        if key == (None, frozenset()):
+            return self.trie
+
+        if key in self._derived_tries:
+            self._derived_tries.move_to_end(key)
+            return self._derived_tries[key]
+
+        trie = type(self.trie)(self.apply_rules(self.trie, *key))
+        self._derived_tries[key] = trie
+        if len(self._derived_tries) > self._max_derived_tries:
+            self._derived_tries.popitem(last=False)
+
+        return trie
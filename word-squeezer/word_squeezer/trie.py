@@ -1,6 +1,10 @@
 import typing as t
 from dataclasses import dataclass, field
 
+if t.TYPE_CHECKING:
+    from .dawg import Dawg
+    from .packed_trie import PackedTrie
+
 
 class Trie:
     """Prefix tree object for efficient word lookup, avoiding exhaustive brute-force character permutations"""
@@ -35,6 +39,26 @@ class Trie:
     def is_prefix(self, word: str) -> bool:
         return self.get_node(word).is_prefix
 
+    def __iter__(self) -> t.Iterator[str]:
+        """Words in sorted order"""
+        stack = [("", self._root)]
+        while stack:
+            prefix, node = stack.pop()
+            if node.is_word:
+                yield prefix
+            stack.extend(
+                (prefix + letter, node.subtrie[letter])
+                for letter in sorted(node.subtrie, reverse=True)
+            )
+
+    @property
+    def root(self) -> Node:
+        return self._root
+
+    def get_child(self, node: Node, letter: str) -> Node:
+        """Single step of get_node, for searches that carry the current node along"""
+        return node.subtrie.get(letter, self._sentinel_node)
+
     def get_node(self, word: str) -> Node:
         node = self._root
         for letter in word:
@@ -42,3 +66,7 @@ class Trie:
                 return self._sentinel_node
             node = node.subtrie[letter]
         return node
+
+
+# the solvers walk any of the prefix trees through root, get_child and get_node
+TRIE = t.Union[Trie, "PackedTrie", "Dawg"]
@@ -1,6 +1,8 @@
 import typing as t
 from pathlib import Path
 
+from .word_list import read_words
+
 
 def read_wordlist(word_list_path: Path) -> t.List[str]:
-    return open(word_list_path).read().split("\n")
+    return read_words(word_list_path)
@@ -0,0 +1,186 @@
+"""Word list loading shared by the word games and metagrams.
+
+Lines are streamed from the file and normalized in a single pass, so a large dictionary
+never sits in memory as one string plus a list of all its lines.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import typing as t
+from array import array
+from pathlib import Path
+
+SYSTEM_WORD_LIST_PATHS = [
+    Path("/usr/share/dict/words"),
+    Path("/usr/dict/words"),
+    Path("/usr/share/dict/web2"),
+]
+
+_TABLE_MAGIC = b"WORDTBL1"
+_TABLE_HEADER = struct.Struct("=8sI")
+
+
+def write_atomically(path: Path, write: t.Callable[[Path], None]) -> None:
+    """Writes a temp file next to the path and renames it, so readers never see it partial.
+
+    The temp file is created like open() creates files, the umask applies to mode 0o666.
+    """
+    path = Path(path)
+    temp_path = path.with_name(f".{path.name}.{os.urandom(8).hex()}")
+    os.close(os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666))
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def find_system_word_list() -> Path:
+    for path in SYSTEM_WORD_LIST_PATHS:
+        if path.exists():
+            return path
+    raise FileNotFoundError("Could not find a system word list in " + ", ".join(map(str, SYSTEM_WORD_LIST_PATHS)))
+
+
+def iter_words(
+    word_list_path: Path,
+    lowercase: bool = False,
+    min_length: t.Optional[int] = None,
+    max_length: t.Optional[int] = None,
+    dedupe: bool = False,
+) -> t.Iterator[str]:
+    """Lazily yields stripped, non-empty words, optionally lowercased, length filtered and deduplicated"""
+    seen = set()
+    with open(word_list_path, encoding="utf-8") as f:
+        for line in f:
+            word = line.strip()
+            if not word:
+                continue
+            if lowercase:
+                word = word.lower()
+            if min_length is not None and len(word) < min_length:
+                continue
+            if max_length is not None and len(word) > max_length:
+                continue
+            if dedupe:
+                if word in seen:
+                    continue
+                seen.add(word)
+            yield word
+
+
+def read_words(word_list_path: Path, **normalization) -> t.List[str]:
+    return list(iter_words(word_list_path, **normalization))
+
+
+def load_word_table(
+    word_list_path: Path, table_path: t.Optional[Path] = None, **normalization
+) -> "SortedWordTable":
+    """Memory-mapped, sorted and unique word table of a word list.
+
+    The table is built once, in the per-user cache directory unless a path is given,
+    and rebuilt when the word list or the normalization options change. A rebuilt
+    table replaces the tables of older versions of the word list.
+    """
+    superseded_tables = []
+    if table_path is None:
+        # named by the word list and options, then by the version of the word list
+        source = f"{Path(word_list_path).resolve()}:{sorted(normalization.items())}"
+        stat = os.stat(word_list_path)
+        version = f"{stat.st_mtime_ns}:{stat.st_size}"
+        table_dir = get_cache_dir()
+        table_prefix = f"word-table-{_short_hash(source)}-"
+        table_path = table_dir / f"{table_prefix}{_short_hash(version)}"
+        superseded_tables = [
+            path for path in table_dir.glob(f"{table_prefix}*") if path != table_path
+        ]
+
+    if not table_path.exists():
+        words = set(iter_words(word_list_path, **normalization))
+        SortedWordTable.dump(words, table_path)
+
+    # a process that still maps a superseded table keeps reading it after the unlink
+    for path in superseded_tables:
+        path.unlink(missing_ok=True)
+
+    return SortedWordTable.load(table_path)
+
+
+def get_cache_dir() -> Path:
+    """Per-user cache directory, under $XDG_CACHE_HOME or ~/.cache, created owner-only"""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    cache_dir = Path(cache_home) / "word-squeezer"
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    return cache_dir
+
+
+def _short_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+
+class SortedWordTable(t.Sequence[str]):
+    """Read-only word table sorted by utf-8 bytes, with binary search membership tests.
+
+    Layout: magic, word count, n + 1 uint32 offsets into the utf-8 word blob, the blob.
+    """
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    @staticmethod
+    def dump(words: t.Iterable[str], table_path: Path) -> None:
+        encoded_words = sorted({word.encode() for word in words})
+        offsets = array("I", [0])
+        for encoded_word in encoded_words:
+            offsets.append(offsets[-1] + len(encoded_word))
+
+        def write(path: Path) -> None:
+            with open(path, "wb") as f:
+                f.write(_TABLE_HEADER.pack(_TABLE_MAGIC, len(encoded_words)))
+                f.write(offsets.tobytes())
+                f.write(b"".join(encoded_words))
+
+        # a concurrent reader never maps a partial table
+        write_atomically(table_path, write)
+
+    @classmethod
+    def load(cls, table_path: Path) -> "SortedWordTable":
+        with open(table_path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, n_words = _TABLE_HEADER.unpack(buffer[: _TABLE_HEADER.size])
+        if magic != _TABLE_MAGIC:
+            raise ValueError(f"{table_path} is not a word table")
+
+        view = memoryview(buffer)
+        offsets_end = _TABLE_HEADER.size + 4 * (n_words + 1)
+        return cls(view[_TABLE_HEADER.size : offsets_end].cast("I"), view[offsets_end:])
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self._encoded(i).decode()
+
+    def __contains__(self, word: object) -> bool:
+        if not isinstance(word, str):
+            return False
+        i = self._bisect(word.encode())
+        return i < len(self) and self._encoded(i) == word.encode()
+
+    def _bisect(self, encoded_word: bytes) -> int:
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            if self._encoded(middle) < encoded_word:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _encoded(self, i: int) -> bytes:
+        return bytes(self._blob[self._offsets[i] : self._offsets[i + 1]])
@@ -1,55 +1,76 @@
 import typing as t
 from pathlib import Path
 import argparse
+from collections import Counter
 
-from .trie import Trie
+from .dawg import load_or_build_dawg
+from .packed_trie import PackedTrie
+from .solver_context import SolverContext
+from .trie import TRIE, Trie
 from .utils import read_wordlist
 
 
 class WordSqueezer:
-    def __init__(self, trie: Trie):
+    def __init__(self, trie: TRIE):
         self.trie = trie
 
     def squeeze(self, word: str) -> t.List[str]:
         """squeeze returns unique and sorted words"""
-        return sorted(set(self._squeeze_raw(word)))
+        return sorted(self._squeeze_raw(word))
+
+    def squeeze_many(self, words: t.Iterable[str]) -> t.List[t.List[str]]:
+        """Batch version of squeeze, the results are returned in the order of the words"""
+        return [self.squeeze(word) for word in words]
 
     def _squeeze_raw(self, word: str) -> t.Iterable[str]:
-        """squeeze_raw may return duplicate words"""
-        yield from self._permute_and_check(word)
+        """squeeze_raw returns unique words, in no particular order"""
+        yield from self._permute_and_check(Counter(word), self.trie.root, prefix=[])
 
-    def _permute_and_check(self, letters: str, prefix: str = "") -> t.Iterable[str]:
+    def _permute_and_check(
+        self, letter_counts: t.Counter[str], node, prefix: t.List[str]
+    ) -> t.Iterable[str]:
         # incrementally produce prefixes from character permutations.
-        for i, letter in enumerate(letters):
-            new_word = prefix + letter
-
-            node = self.trie.get_node(new_word)
-            if node.is_word:
-                yield new_word
+        # the trie node of the prefix is carried along, so every extension is a single child lookup,
+        # and the prefix is a shared letter buffer.
+        # letters are drawn from a multiset, so a repeated letter is tried once per position
+        # and no prefix, hence no word, is produced twice.
+        for letter, count in letter_counts.items():
+            if not count:
+                continue
+
+            child = self.trie.get_child(node, letter)
+            if child.is_word:
+                yield "".join(prefix) + letter
 
             # check for prospective words starting with the prefix in the prefix tree.
             # if there are no matches with the current prefix we can avoid exhaustive brute-force permutations.
-            if node.is_prefix:
-                yield from self._permute_and_check(
-                    letters[:i] + letters[i + 1 :], prefix=new_word
-                )
+            if child.is_prefix:
+                letter_counts[letter] = count - 1
+                prefix.append(letter)
+                yield from self._permute_and_check(letter_counts, child, prefix)
+                prefix.pop()
+                letter_counts[letter] = count
 
 
 def solve_word_squeezer(
-    source_word: str, wordlist: t.List[str], target_word_length: int = None
+    source_word: str,
+    wordlist: t.Optional[t.List[str]] = None,
+    target_word_length: int = None,
+    trie_class: t.Type[TRIE] = Trie,
+    context: t.Optional[SolverContext] = None,
 ):
-    # exclude the source word itself
-    wordlist = filter(lambda x: x != source_word, wordlist)
+    """Prints the words squeezed from the source word, pass a context to reuse its trie across calls"""
+    if context is None:
+        context = SolverContext.from_wordlist(wordlist, trie_class)
 
-    if target_word_length:
-        wordlist = filter(lambda x: len(x) >= target_word_length, wordlist)
-
-    trie = Trie(list(wordlist))
-    ws = WordSqueezer(trie)
+    ws = WordSqueezer(context.trie)
 
     squeezed_words = ws.squeeze(source_word)
 
-    for word in squeezed_words:
+    # exclude the source word itself
+    for word in context.apply_rules(
+        squeezed_words, target_word_length, excluded_words=(source_word,)
+    ):
         print(word)
 
 
@@ -58,9 +79,7 @@ def main():
         "Word squeezer finds words from the source word's characters"
     )
     parser.add_argument("source_word", type=str, help="Source word")
-    parser.add_argument(
-        "-f", "--word-list-file", type=Path, required=True, help="Wordlist file path"
-    )
+    parser.add_argument("-f", "--word-list-file", type=Path, help="Wordlist file path")
     parser.add_argument(
         "-l",
         "--minimum-word-length",
@@ -68,12 +87,35 @@ def main():
         required=False,
         help="Minimum length of target words",
     )
+    parser.add_argument(
+        "--packed-trie",
+        action="store_true",
+        help="Use the array-backed trie, slower to query but much smaller for large word lists",
+    )
+    parser.add_argument(
+        "--dawg-file",
+        type=Path,
+        help="Prebuilt DAWG of the word list, built from the word list file on first use",
+    )
     args = parser.parse_args()
+    if args.dawg_file is None and args.word_list_file is None:
+        parser.error("the word list file is required without a DAWG file")
+
+    if args.dawg_file is not None:
+        solve_word_squeezer(
+            args.source_word,
+            target_word_length=args.minimum_word_length,
+            context=SolverContext(
+                load_or_build_dawg(args.dawg_file, args.word_list_file)
+            ),
+        )
+        return
 
     solve_word_squeezer(
         args.source_word,
         read_wordlist(args.word_list_file),
         args.minimum_word_length,
+        PackedTrie if args.packed_trie else Trie,
     )
 
 
@@ -1,27 +1,285 @@
 import typing as t
 from pathlib import Path
 import argparse
+import functools
+import heapq
+import itertools
+import multiprocessing
+import os
+import sys
 import textwrap
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-from .trie import Trie
+from .dawg import load_or_build_dawg
+from .packed_trie import PackedTrie
+from .solver_context import SolverContext
+from .trie import TRIE, Trie
 from .utils import read_wordlist
 
 WordGrid = t.List[t.List[str]]
 
+# Wordament tile values
+LETTER_SCORES = {
+    "a": 2, "b": 5, "c": 3, "d": 3, "e": 1, "f": 5, "g": 4, "h": 4, "i": 2,
+    "j": 10, "k": 6, "l": 3, "m": 4, "n": 2, "o": 2, "p": 4, "q": 8, "r": 2,
+    "s": 2, "t": 2, "u": 4, "v": 6, "w": 6, "x": 9, "y": 5, "z": 8,
+}  # fmt: skip
+
+
+class WordamentWord(t.NamedTuple):
+    word: str
+    # (row, column) of the slots that spell the word
+    path: t.Tuple[t.Tuple[int, int], ...]
+    score: int
+
 
 class WordamentSolver:
     """Microsoft Wordament solver"""
 
-    def __init__(self, trie: Trie):
+    def __init__(self, trie: TRIE, fast: bool = True):
         self.trie = trie
+        self.fast = fast
 
-    def squeeze(self, word_grid: WordGrid) -> t.List[str]:
+    def squeeze(
+        self, word_grid: WordGrid, workers: t.Optional[int] = None
+    ) -> t.List[str]:
+        """Words of every path, pass workers to search the start cells in parallel"""
+        if workers is not None and workers > 1:
+            return [
+                word for word, _ in self._find_cell_paths_parallel(word_grid, workers)
+            ]
         return list(self._squeeze_raw(word_grid))
 
+    def iter_words(
+        self, word_grid: WordGrid, time_budget: t.Optional[float] = None
+    ) -> t.Iterator[WordamentWord]:
+        """Streams every word once, as soon as it is found, with the first path that spells it.
+
+        The search stops early once the time budget in seconds is used up.
+        """
+        slot_scores = self._get_slot_scores(word_grid)
+        found_words = set()
+        for word, path in self._iter_cell_paths(word_grid, time_budget=time_budget):
+            if word not in found_words:
+                found_words.add(word)
+                yield self._to_wordament_word(word_grid, word, path, slot_scores)
+
+    def solve(
+        self,
+        word_grid: WordGrid,
+        top_k: t.Optional[int] = None,
+        time_budget: t.Optional[float] = None,
+        workers: t.Optional[int] = None,
+    ) -> t.List[WordamentWord]:
+        """Unique words with their best scoring path, highest score first, at most top_k of them.
+
+        The search stops early once the time budget in seconds is used up.
+        Pass workers to search the start cells in parallel.
+        """
+        if workers is not None and workers > 1:
+            cell_paths = self._find_cell_paths_parallel(word_grid, workers, time_budget)
+        else:
+            cell_paths = self._iter_cell_paths(word_grid, time_budget=time_budget)
+
+        slot_scores = self._get_slot_scores(word_grid)
+        best_paths: t.Dict[str, t.Tuple[int, t.Tuple[int, ...]]] = {}
+        for word, path in cell_paths:
+            score = sum(slot_scores[cell] for cell in path)
+            if word not in best_paths or score > best_paths[word][0]:
+                best_paths[word] = (score, path)
+
+        def rank(word: str) -> t.Tuple[int, str]:
+            return -best_paths[word][0], word
+
+        words = (
+            sorted(best_paths, key=rank)
+            if top_k is None
+            else heapq.nsmallest(top_k, best_paths, key=rank)
+        )
+        return [
+            self._to_wordament_word(word_grid, word, best_paths[word][1], slot_scores)
+            for word in words
+        ]
+
+    def solve_many(
+        self,
+        word_grids: t.Iterable[WordGrid],
+        workers: t.Optional[int] = None,
+        top_k: t.Optional[int] = None,
+        time_budget: t.Optional[float] = None,
+    ) -> t.List[t.List[WordamentWord]]:
+        """solve for a batch of boards, spread over a process pool, in the order of the boards"""
+        word_grids = list(word_grids)
+        with self._get_process_pool(workers) as pool:
+            return list(
+                pool.map(
+                    _solve_in_worker,
+                    word_grids,
+                    itertools.repeat(top_k),
+                    itertools.repeat(time_budget),
+                )
+            )
+
+    def _find_cell_paths_parallel(
+        self,
+        word_grid: WordGrid,
+        workers: int,
+        time_budget: t.Optional[float] = None,
+    ) -> t.List[t.Tuple[str, t.Tuple[int, ...]]]:
+        # every start cell is searched as a task of its own, merging the tasks in start cell order
+        # gives the same paths in the same order as the sequential search
+        # the monotonic clock is shared by the processes, so all tasks stop at the same deadline
+        n_cells = len(word_grid) * len(word_grid[0])
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+        with self._get_process_pool(workers) as pool:
+            paths_by_start = pool.map(
+                _find_cell_paths_in_worker,
+                itertools.repeat(word_grid, n_cells),
+                range(n_cells),
+                itertools.repeat(deadline, n_cells),
+            )
+            return [path for paths in paths_by_start for path in paths]
+
+    def _get_process_pool(self, workers: t.Optional[int]) -> ProcessPoolExecutor:
+        # forked workers inherit the trie, instead of unpickling a copy each. fork is only
+        # safe on Linux, elsewhere the platform default start method pickles the trie
+        mp_context = (
+            multiprocessing.get_context("fork")
+            if sys.platform.startswith("linux")
+            else None
+        )
+        return ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self.trie, self.fast),
+        )
+
     def _squeeze_raw(self, word_grid: WordGrid) -> t.Iterable[str]:
+        if self.fast:
+            for word, _ in self._iter_cell_paths(word_grid):
+                yield word
+            return
+
         for start_head in self._get_start_heads(word_grid):
             yield from self._traverse_grid(word_grid, [start_head])
 
+    def _iter_cell_paths(
+        self,
+        word_grid: WordGrid,
+        starts: t.Optional[t.Iterable[int]] = None,
+        time_budget: t.Optional[float] = None,
+    ) -> t.Iterable[t.Tuple[str, t.Tuple[int, ...]]]:
+        # the grid is flattened to cell indices, with the in-bounds neighbors of every cell precomputed,
+        # and visited cells are the bits of an int. same words in the same order as _traverse_grid.
+        cells = [slot for row in word_grid for slot in row]
+        cell_neighbors = self._get_cell_neighbors(len(word_grid), len(word_grid[0]))
+        deadline = None if time_budget is None else time.monotonic() + time_budget
+
+        for start in range(len(cells)) if starts is None else starts:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            node = self._walk(self.trie.root, cells[start])
+            if not node.is_prefix:
+                continue
+
+            yield from self._traverse_cells(
+                cells,
+                cell_neighbors,
+                start,
+                1 << start,
+                node,
+                [cells[start]],
+                [start],
+                deadline,
+            )
+
+    def _traverse_cells(
+        self,
+        cells: t.List[str],
+        cell_neighbors: t.Tuple[t.Tuple[int, ...], ...],
+        head: int,
+        visited: int,
+        node,
+        path_letters: t.List[str],
+        path: t.List[int],
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterable[t.Tuple[str, t.Tuple[int, ...]]]:
+        # the deadline is checked on every expansion, not only on found words,
+        # so a long search through prefixes that lead to few words stops in time as well.
+        # once it passed, every pending expansion up the path returns right away
+        if deadline is not None and time.monotonic() >= deadline:
+            return
+
+        # the trie node of the path is carried along, so every step is a lookup of the new slot only
+        for cell in cell_neighbors[head]:
+            if visited >> cell & 1:
+                continue
+
+            child = self._walk(node, cells[cell])
+            if child.is_word:
+                yield "".join(path_letters) + cells[cell], (*path, cell)
+
+            if child.is_prefix:
+                path_letters.append(cells[cell])
+                path.append(cell)
+                yield from self._traverse_cells(
+                    cells,
+                    cell_neighbors,
+                    cell,
+                    visited | 1 << cell,
+                    child,
+                    path_letters,
+                    path,
+                    deadline,
+                )
+                path.pop()
+                path_letters.pop()
+
+    @staticmethod
+    def _get_slot_scores(word_grid: WordGrid) -> t.List[int]:
+        return [
+            sum(LETTER_SCORES.get(letter, 0) for letter in slot)
+            for row in word_grid
+            for slot in row
+        ]
+
+    @staticmethod
+    def _to_wordament_word(
+        word_grid: WordGrid,
+        word: str,
+        path: t.Tuple[int, ...],
+        slot_scores: t.List[int],
+    ) -> WordamentWord:
+        j_max = len(word_grid[0])
+        return WordamentWord(
+            word,
+            tuple(divmod(cell, j_max) for cell in path),
+            sum(slot_scores[cell] for cell in path),
+        )
+
+    def _walk(self, node, letters: str):
+        # slots may hold more than one letter, e.g. "qu"
+        for letter in letters:
+            node = self.trie.get_child(node, letter)
+        return node
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_cell_neighbors(
+        cls, i_max: int, j_max: int
+    ) -> t.Tuple[t.Tuple[int, ...], ...]:
+        return tuple(
+            tuple(
+                i_new * j_max + j_new
+                for i_new, j_new in cls.walk_around(i, j)
+                if 0 <= i_new < i_max and 0 <= j_new < j_max
+            )
+            for i in range(i_max)
+            for j in range(j_max)
+        )
+
     def _traverse_grid(
         self, word_grid: WordGrid, path: t.List[t.Tuple[int, int]] = None
     ):
@@ -75,18 +333,67 @@ class WordamentSolver:
                 yield i, j
 
 
+# the solver of a pool worker process, set up by _init_worker
+_worker_solver: t.Optional[WordamentSolver] = None
+
+
+def _init_worker(trie: TRIE, fast: bool) -> None:
+    global _worker_solver
+    _worker_solver = WordamentSolver(trie, fast)
+
+
+def _find_cell_paths_in_worker(
+    word_grid: WordGrid, start: int, deadline: t.Optional[float]
+) -> t.List[t.Tuple[str, t.Tuple[int, ...]]]:
+    time_budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+    return list(
+        _worker_solver._iter_cell_paths(word_grid, [start], time_budget=time_budget)
+    )
+
+
+def _solve_in_worker(
+    word_grid: WordGrid, top_k: t.Optional[int], time_budget: t.Optional[float]
+) -> t.List[WordamentWord]:
+    return _worker_solver.solve(word_grid, top_k=top_k, time_budget=time_budget)
+
+
 def solve_wordament(
-    word_grid: WordGrid, wordlist: t.List[str], target_word_length: int = None
+    word_grid: WordGrid,
+    wordlist: t.Optional[t.List[str]] = None,
+    target_word_length: int = None,
+    trie_class: t.Type[TRIE] = Trie,
+    context: t.Optional[SolverContext] = None,
+    scores: bool = False,
+    top_k: t.Optional[int] = None,
+    time_budget: t.Optional[float] = None,
+    workers: t.Optional[int] = None,
 ):
-    if target_word_length:
-        wordlist = filter(lambda x: len(x) >= target_word_length, wordlist)
+    """Prints the words found in the grid, pass a context to reuse its trie across calls.
+
+    With scores, every word is printed once, best first, with its score and path.
+    With workers, the start cells are searched by a process pool.
+    """
+    if context is None:
+        context = SolverContext.from_wordlist(wordlist, trie_class)
 
-    trie = Trie(list(wordlist))
-    ws = WordamentSolver(trie)
+    ws = WordamentSolver(context.trie)
 
-    squeezed_words = ws.squeeze(word_grid)
+    if scores:
+        solved_words = [
+            solved_word
+            for solved_word in ws.solve(
+                word_grid, time_budget=time_budget, workers=workers
+            )
+            if len(solved_word.word) >= (target_word_length or 0)
+        ]
+        for solved_word in solved_words[:top_k]:
+            path = " ".join(f"{i},{j}" for i, j in solved_word.path)
+            print(f"{solved_word.word} {solved_word.score} {path}")
+        return
 
-    for word in squeezed_words:
+    squeezed_words = ws.squeeze(word_grid, workers=workers)
+
+    for word in context.apply_rules(squeezed_words, target_word_length):
         print(word)
 
 
@@ -111,9 +418,7 @@ def main():
         type=str,
         help="Word grid, input example: 'l r t l|f a a n|g c s t|l e e l'",
     )
-    parser.add_argument(
-        "-f", "--word-list-file", type=Path, required=True, help="Wordlist file path"
-    )
+    parser.add_argument("-f", "--word-list-file", type=Path, help="Wordlist file path")
     parser.add_argument(
         "-l",
         "--minimum-word-length",
@@ -121,16 +426,60 @@ def main():
         required=False,
         help="Minimum length of target words",
     )
+    parser.add_argument(
+        "--packed-trie",
+        action="store_true",
+        help="Use the array-backed trie, slower to query but much smaller for large word lists",
+    )
+    parser.add_argument(
+        "--dawg-file",
+        type=Path,
+        help="Prebuilt DAWG of the word list, built from the word list file on first use",
+    )
+    parser.add_argument(
+        "--scores",
+        action="store_true",
+        help="Print every word once, best first, with its score and path",
+    )
+    parser.add_argument(
+        "--top", type=int, help="Print at most this many words, with --scores"
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        help="Stop searching after this many seconds, with --scores",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Search the start cells with this many processes, worth it for large boards",
+    )
     args = parser.parse_args()
+    if args.dawg_file is None and args.word_list_file is None:
+        parser.error("the word list file is required without a DAWG file")
+    if not args.scores and (args.top is not None or args.time_budget is not None):
+        parser.error("--top and --time-budget require --scores")
 
     def parse_word_grid(s: str) -> WordGrid:
         lines = s.split("|")
         return [line.split() for line in lines]
 
+    if args.dawg_file is not None:
+        context = SolverContext(load_or_build_dawg(args.dawg_file, args.word_list_file))
+    else:
+        context = SolverContext.from_wordlist(
+            read_wordlist(args.word_list_file), PackedTrie if args.packed_trie else Trie
+        )
+
     solve_wordament(
         parse_word_grid(args.word_grid),
-        read_wordlist(args.word_list_file),
-        args.minimum_word_length,
+        target_word_length=args.minimum_word_length,
+        context=context,
+        scores=args.scores,
+        top_k=args.top,
+        time_budget=args.time_budget,
+        workers=args.jobs,
     )
 
 